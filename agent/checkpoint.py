@@ -0,0 +1,87 @@
+import os
+import random
+import shutil
+import numpy as np
+import torch
+from config import CHECKPOINT_FOLDER_PATH
+
+def save_checkpoint(agent, progress, folder=CHECKPOINT_FOLDER_PATH):
+    """
+    Guarda todo lo necesario para reanudar un entrenamiento:
+    - `state.pt`: pesos del modelo (y de la red objetivo), estado del optimizador,
+      contadores del agente, estado de los generadores aleatorios y `progress`
+      (el diccionario de métricas del bucle de entrenamiento).
+    - `memory/`: la memoria de repetición como arrays .npy mapeables en memoria.
+
+    Se escribe primero en una carpeta temporal que luego sustituye a la anterior,
+    para que una interrupción a mitad de guardado no deje un checkpoint corrupto.
+    """
+    tmp_folder = folder.rstrip('/\\') + '.tmp'
+    old_folder = folder.rstrip('/\\') + '.old'
+    if os.path.exists(tmp_folder):
+        shutil.rmtree(tmp_folder)
+    os.makedirs(tmp_folder)
+
+    state = {
+        'model': agent.model.state_dict(),
+        'target_model': agent.target_model.state_dict() if agent.target_model is not None else None,
+        'optimizer': agent.optimizer.state_dict(),
+        'n_games': agent.n_games,
+        'epsilon': agent.epsilon,
+        'train_steps': agent.train_steps,
+        'env_steps': agent.env_steps,
+        'rng': {
+            'python': random.getstate(),
+            'numpy': np.random.get_state(),
+            'torch': torch.get_rng_state(),
+            'memory': agent.memory.rng.bit_generator.state,
+            'agent': agent.rng.getstate(),
+            'agent_numpy': agent.np_rng.bit_generator.state,
+        },
+        'progress': progress,
+    }
+    torch.save(state, os.path.join(tmp_folder, 'state.pt'))
+    agent.memory.save(os.path.join(tmp_folder, 'memory'))
+
+    # Sustituir el checkpoint anterior
+    if os.path.exists(folder):
+        if os.path.exists(old_folder):
+            shutil.rmtree(old_folder)
+        os.rename(folder, old_folder)
+    os.rename(tmp_folder, folder)
+    if os.path.exists(old_folder):
+        shutil.rmtree(old_folder)
+
+def load_checkpoint(agent, folder=CHECKPOINT_FOLDER_PATH):
+    """
+    Restaura en `agent` un checkpoint escrito por `save_checkpoint`
+    y devuelve el diccionario `progress` que se guardó con él.
+    Lanza FileNotFoundError si no hay checkpoint en `folder`.
+    """
+    state_path = os.path.join(folder, 'state.pt')
+    if not os.path.exists(state_path):
+        raise FileNotFoundError(f"No se encontró ningún checkpoint en '{folder}'.")
+
+    state = torch.load(state_path, map_location=torch.device('cpu'), weights_only=False)
+    agent.model.load_state_dict(state['model'])
+    if agent.target_model is not None:
+        # Si el checkpoint no tenía red objetivo, se parte de una copia del modelo
+        agent.target_model.load_state_dict(state['target_model'] or state['model'])
+    agent.optimizer.load_state_dict(state['optimizer'])
+    agent.n_games = state['n_games']
+    agent.epsilon = state['epsilon']
+    agent.train_steps = state['train_steps']
+    agent.env_steps = state['env_steps']
+    agent.weights_version += 1
+
+    rng = state['rng']
+    random.setstate(rng['python'])
+    np.random.set_state(rng['numpy'])
+    torch.set_rng_state(rng['torch'])
+    agent.memory.rng.bit_generator.state = rng['memory']
+    if 'agent' in rng:
+        agent.rng.setstate(rng['agent'])
+        agent.np_rng.bit_generator.state = rng['agent_numpy']
+
+    agent.memory.load(os.path.join(folder, 'memory'))
+    return state['progress']
@@ -0,0 +1,51 @@
+import random
+from collections import deque
+from snake_game.layouts import generate_layout
+from config import CURRICULUM_STAGES, CURRICULUM_WINDOW
+
+class CurriculumScheduler:
+    """
+    Currículo de entrenamiento: empieza en tableros pequeños con pocas trampas
+    y pasa a la etapa siguiente (más grande o con más trampas) cuando la media
+    de las últimas `window` partidas de la etapa alcanza su umbral `promote_at`.
+    Cada partida se juega en un tablero nuevo con inicio y trampas al azar.
+    """
+    def __init__(self, stages=CURRICULUM_STAGES, window=CURRICULUM_WINDOW, seed=None):
+        if not stages:
+            raise ValueError("El currículo necesita al menos una etapa")
+        self.stages = stages
+        self.stage_index = 0
+        self.recent = deque(maxlen=window)
+        self.rng = random.Random(seed)
+
+    @property
+    def stage(self):
+        return self.stages[self.stage_index]
+
+    def next_layout(self):
+        """Tablero aleatorio para la próxima partida según la etapa actual."""
+        stage = self.stage
+        n_traps = round(stage['trap_density'] * stage['width'] * stage['height'])
+        return generate_layout(stage['width'], stage['height'], n_traps, self.rng)
+
+    def record(self, score):
+        """Registra el puntaje de una partida. Devuelve True si se pasa a la etapa siguiente."""
+        self.recent.append(score)
+        promote_at = self.stage.get('promote_at')
+        if (promote_at is None or self.stage_index == len(self.stages) - 1
+                or len(self.recent) < self.recent.maxlen):
+            return False
+        if sum(self.recent) / len(self.recent) < promote_at:
+            return False
+        self.stage_index += 1
+        self.recent.clear()
+        return True
+
+    def state_dict(self):
+        return {'stage_index': self.stage_index, 'recent': list(self.recent), 'rng': self.rng.getstate()}
+
+    def load_state_dict(self, state):
+        self.stage_index = min(state['stage_index'], len(self.stages) - 1)
+        self.recent.clear()
+        self.recent.extend(state['recent'])
+        self.rng.setstate(state['rng'])
@@ -1,135 +1,288 @@
+import time
 import torch
 import random
 import numpy as np
-from collections import deque
-from snake_game.game import SnakeGameAI, Direction, Point
-from .model import Linear_QNet
-from config import MAX_MEMORY, BATCH_SIZE, LR, GAMMA, BLOCK_SIZE
+from snake_game.game import SnakeGameAI
+from snake_game.vec_env import VecSnakeEnv
+from .model import Linear_QNet, NumpyQNet, QTable, binary_states
+from .encoders import make_encoder
+from .replay_memory import ReplayMemory, PrioritizedReplayMemory
+from utils.seeding import derive_seed
+from config import (
+    MAX_MEMORY, BATCH_SIZE, LR, GAMMA,
+    TRAIN_EVERY_STEPS, GRADIENT_STEPS, MINI_BATCH_SIZE, WARMUP_SIZE,
+    TARGET_UPDATE, TARGET_UPDATE_INTERVAL, TAU, DOUBLE_DQN, PRIORITIZED_REPLAY,
+    ACTION_BACKEND, TABLE_COMPILE_AFTER
+)
+
+def _as_tensor(data, dtype):
+    """Convierte listas, tuplas o arrays a tensor; los tensores solo se convierten de tipo."""
+    if isinstance(data, torch.Tensor):
+        return data.to(dtype)
+    return torch.tensor(np.array(data), dtype=dtype)
 
 class Agent:
-    def __init__(self):
+    def __init__(self, seed=None):
         self.n_games = 0
         self.epsilon = 0  # Parámetro para la aleatoriedad (exploración)
         self.gamma = GAMMA  # Factor de descuento
-        self.memory = deque(maxlen=MAX_MEMORY)  # Estructura de datos que auto-elimina elementos viejos
+        # Generadores propios para la exploración (uno por cada ruta de selección de acciones),
+        # independientes del estado global: con la misma semilla se repiten las mismas decisiones
+        self.rng = random.Random(derive_seed(seed, 'agent'))
+        self.np_rng = np.random.default_rng(derive_seed(seed, 'agent_numpy'))
+        # Codificador de observaciones (config.py): fija el tamaño de la red y de la memoria
+        self.encoder = make_encoder()
+        # Buffer circular que sobrescribe las experiencias más viejas (con muestreo prioritario opcional)
+        memory_class = PrioritizedReplayMemory if PRIORITIZED_REPLAY else ReplayMemory
+        self.memory = memory_class(MAX_MEMORY, state_size=self.encoder.size, seed=derive_seed(seed, 'memory'))
+        self.env_steps = 0  # Pasos del entorno observados (para el calendario de actualizaciones)
         
         # Modelo y optimizador
-        self.model = Linear_QNet()
+        self.model = Linear_QNet(self.encoder.size)
         self.optimizer = torch.optim.Adam(self.model.parameters(), lr=LR)
         self.criterion = torch.nn.MSELoss() # Mean Squared Error como función de pérdida
+        self.train_steps = 0  # Pasos de optimización realizados
+        self.weights_version = 0  # Aumenta cada vez que cambian los pesos del modelo
+        self._reset_train_stats()
+
+        # Red objetivo (opcional): copia congelada del modelo usada para calcular los targets
+        if TARGET_UPDATE not in (None, 'hard', 'soft'):
+            raise ValueError(f"TARGET_UPDATE debe ser None, 'hard' o 'soft', no {TARGET_UPDATE!r}")
+        if DOUBLE_DQN and TARGET_UPDATE is None:
+            raise ValueError("DOUBLE_DQN requiere una red objetivo (TARGET_UPDATE = 'hard' o 'soft')")
+        self.target_model = None
+        if TARGET_UPDATE is not None:
+            self.target_model = Linear_QNet(self.encoder.size)
+            self.target_model.load_state_dict(self.model.state_dict())
+            self.target_model.requires_grad_(False)
+
+        # Réplica en NumPy del modelo para elegir acciones paso a paso sin el coste de PyTorch.
+        # Comparte memoria con los parámetros, así que ve cada paso del optimizador sin copiar nada.
+        if ACTION_BACKEND not in ('numpy', 'torch', 'table'):
+            raise ValueError(f"ACTION_BACKEND debe ser 'numpy', 'torch' o 'table', no {ACTION_BACKEND!r}")
+        self.fast_model = None
+        if ACTION_BACKEND in ('numpy', 'table'):
+            self.fast_model = NumpyQNet(self.model)
+            self.check_fast_model()
+
+        # Tabla de consulta con la acción greedy de cada estado binario. Es una foto de los
+        # pesos y compilarla cuesta unas cien pasadas por la réplica en NumPy, así que tras un
+        # cambio de pesos (`weights_version`) se usa la réplica y la tabla solo se recompila
+        # cuando los pesos llevan TABLE_COMPILE_AFTER acciones sin cambiar.
+        self.table = None
+        if ACTION_BACKEND == 'table':
+            if not self.encoder.binary:
+                raise ValueError(f"ACTION_BACKEND = 'table' requiere un codificador binario, no {self.encoder.name!r}")
+            self.table = QTable(self.model)
+            self._table_version = self.weights_version
+            self._stable_version = self.weights_version  # Versión de los pesos cuyas acciones se cuentan
+            self._stable_actions = 0
+
+    def _reset_train_stats(self):
+        # Acumuladores de instrumentación de train_step (ver `pop_train_stats`)
+        self._train_stats = {'updates': 0, 'samples': 0, 'loss': 0.0, 'q_sum': 0.0, 'q_max': float('-inf'), 'seconds': 0.0}
+
+    def pop_train_stats(self):
+        """
+        Devuelve las estadísticas de entrenamiento acumuladas desde la última llamada
+        (pasos de optimización, pérdida media, Q-valor máximo medio y absoluto de las
+        predicciones, ms por paso) y reinicia los acumuladores.
+        """
+        stats = self._train_stats
+        updates = stats['updates']
+        self._reset_train_stats()
+        if updates == 0:
+            return {'train_updates': 0, 'train_samples': 0}
+        return {
+            'train_updates': updates,
+            'train_samples': stats['samples'],
+            'loss': stats['loss'] / updates,
+            'q_mean': stats['q_sum'] / stats['samples'],
+            'q_max': stats['q_max'],
+            'train_step_ms': stats['seconds'] / updates * 1000,
+        }
+
+    def check_fast_model(self, states=None, atol=1e-5):
+        """
+        Comprueba que la réplica en NumPy da los mismos Q-valores que el modelo de PyTorch.
+        Por defecto usa los 2^11 estados binarios posibles (o estados aleatorios si el
+        codificador no es 'basic'). Lanza RuntimeError si difieren.
+        """
+        if self.fast_model is None:
+            return
+        if states is None:
+            if self.encoder.name == 'basic':
+                states = binary_states(self.encoder.size)
+            else:
+                states = np.random.default_rng(0).random((2048, self.encoder.size))
+        with torch.no_grad():
+            expected = self.model(torch.as_tensor(states, dtype=torch.float)).numpy()
+        if not np.allclose(self.fast_model(states), expected, atol=atol):
+            raise RuntimeError("La réplica en NumPy de Linear_QNet no coincide con el modelo de PyTorch.")
 
     def get_state(self, game: SnakeGameAI):
         """
-        Construye el vector de estado de 11 elementos a partir del juego.
+        Construye el vector de estado a partir del juego con el codificador configurado
+        (11 elementos con el codificador 'basic').
         """
-        head = game.head
-        
-        # Puntos de referencia para comprobar colisiones
-        point_l = Point(head.x - BLOCK_SIZE, head.y)
-        point_r = Point(head.x + BLOCK_SIZE, head.y)
-        point_u = Point(head.x, head.y - BLOCK_SIZE)
-        point_d = Point(head.x, head.y + BLOCK_SIZE)
-        
-        # Dirección actual (one-hot encoded)
-        dir_l = game.direction == Direction.LEFT
-        dir_r = game.direction == Direction.RIGHT
-        dir_u = game.direction == Direction.UP
-        dir_d = game.direction == Direction.DOWN
-        
-        state = [
-            # Peligro inmediato (recto, derecha, izquierda)
-            # Peligro recto
-            (dir_r and game._is_collision(point_r)) or 
-            (dir_l and game._is_collision(point_l)) or 
-            (dir_u and game._is_collision(point_u)) or 
-            (dir_d and game._is_collision(point_d)),
-
-            # Peligro a la derecha (relativo a la dirección actual)
-            (dir_u and game._is_collision(point_r)) or 
-            (dir_d and game._is_collision(point_l)) or 
-            (dir_l and game._is_collision(point_u)) or 
-            (dir_r and game._is_collision(point_d)),
-
-            # Peligro a la izquierda (relativo a la dirección actual)
-            (dir_d and game._is_collision(point_r)) or 
-            (dir_u and game._is_collision(point_l)) or 
-            (dir_r and game._is_collision(point_u)) or 
-            (dir_l and game._is_collision(point_d)),
-            
-            # Dirección del movimiento
-            dir_l,
-            dir_r,
-            dir_u,
-            dir_d,
-            
-            # Ubicación de la comida
-            game.food.x < game.head.x,  # Comida a la izquierda
-            game.food.x > game.head.x,  # Comida a la derecha
-            game.food.y < game.head.y,  # Comida arriba
-            game.food.y > game.head.y   # Comida abajo
-        ]
+        return self.encoder.encode(game)
 
-        return np.array(state, dtype=int)
+    def get_states(self, env: VecSnakeEnv):
+        """
+        Versión en lote de `get_state` para todas las partidas de un VecSnakeEnv.
+        Devuelve un array de forma (N, tamaño del codificador). Solo para codificadores
+        con `batched = True` ('basic').
+        """
+        return self.encoder.encode_batch(env)
 
     def remember(self, state, action, reward, next_state, done):
-        """Almacena una tupla de experiencia en la memoria de repetición."""
-        self.memory.append((state, action, reward, next_state, done))
+        """Almacena una experiencia en la memoria de repetición (la acción one-hot se guarda como índice)."""
+        self.memory.push(state, int(np.argmax(action)), reward, next_state, done)
 
-    def train_long_memory(self):
+    def train_long_memory(self, batch_size=BATCH_SIZE):
         """Entrena el modelo usando un lote de experiencias de la memoria."""
-        if len(self.memory) > BATCH_SIZE:
-            # Muestreo aleatorio para romper la correlación entre experiencias consecutivas
-            mini_sample = random.sample(self.memory, BATCH_SIZE)
-        else:
-            mini_sample = self.memory # Usar toda la memoria si es más pequeña que el BATCH_SIZE
+        # Muestreo aleatorio para romper la correlación entre experiencias consecutivas
+        # (usa toda la memoria si es más pequeña que el tamaño del lote)
+        batch, indices, weights = self.memory.sample_weighted(batch_size)
+        td_errors = self.train_step(*batch, weights=weights)
+        # Con memoria prioritaria, las transiciones vistas actualizan su prioridad
+        self.memory.update_priorities(indices, td_errors)
 
-        # Descomprimir las tuplas en listas separadas
-        states, actions, rewards, next_states, dones = zip(*mini_sample)
-        self.train_step(states, actions, rewards, next_states, dones)
+    def scheduled_update(self, n_steps=1):
+        """
+        Registra `n_steps` pasos del entorno y ejecuta las actualizaciones que
+        correspondan según el calendario de config.py: cada TRAIN_EVERY_STEPS
+        pasos, GRADIENT_STEPS pasos de gradiente con minilotes de MINI_BATCH_SIZE,
+        siempre que la memoria tenga al menos WARMUP_SIZE transiciones.
+        Devuelve el número de pasos de gradiente realizados.
+        """
+        previous = self.env_steps
+        self.env_steps += n_steps
+        if TRAIN_EVERY_STEPS <= 0 or len(self.memory) < WARMUP_SIZE:
+            return 0
+
+        # Con pasos en lote (varios entornos) pueden vencer varias actualizaciones a la vez
+        n_updates = self.env_steps // TRAIN_EVERY_STEPS - previous // TRAIN_EVERY_STEPS
+        for _ in range(n_updates * GRADIENT_STEPS):
+            self.train_long_memory(MINI_BATCH_SIZE)
+        return n_updates * GRADIENT_STEPS
 
     def train_short_memory(self, state, action, reward, next_state, done):
         """Entrena el modelo con la última experiencia obtenida."""
         self.train_step(state, action, reward, next_state, done)
     
-    def train_step(self, state, action, reward, next_state, done):
+    def train_step(self, state, action, reward, next_state, done, weights=None):
         """
         Realiza un paso de entrenamiento completo (el corazón del algoritmo DQL).
         Calcula la pérdida usando la ecuación de Bellman y actualiza los pesos del modelo.
+        `weights` son los pesos de importancia por transición (memoria prioritaria).
+        Devuelve el error TD absoluto de cada transición como array de NumPy.
         """
-        # Convertir a tensores de PyTorch
-        state = torch.tensor(np.array(state), dtype=torch.float)
-        next_state = torch.tensor(np.array(next_state), dtype=torch.float)
-        action = torch.tensor(np.array(action), dtype=torch.long)
-        reward = torch.tensor(np.array(reward), dtype=torch.float)
-        
+        start_time = time.perf_counter()
+
+        # Convertir a tensores de PyTorch (los lotes de la memoria ya llegan como tensores)
+        state = _as_tensor(state, torch.float)
+        next_state = _as_tensor(next_state, torch.float)
+        action = _as_tensor(action, torch.long)
+        reward = _as_tensor(reward, torch.float)
+        done = _as_tensor(done, torch.bool)
+
         # Ajustar dimensiones si es un solo elemento (entrenamiento de memoria corta)
         if len(state.shape) == 1:
             state = torch.unsqueeze(state, 0)
             next_state = torch.unsqueeze(next_state, 0)
             action = torch.unsqueeze(action, 0)
             reward = torch.unsqueeze(reward, 0)
-            done = (done, )
+            done = torch.unsqueeze(done, 0)
+
+        # Las acciones pueden llegar en one-hot [recto, derecha, izquierda] o como índices
+        if action.dim() == 2:
+            action = torch.argmax(action, dim=1)
 
         # 1. Obtener los Q-valores predichos por el modelo actual (Q(s, a))
         pred = self.model(state)
-        
+
         # 2. Calcular los Q-valores objetivo usando la ecuación de Bellman:
         # Q_nuevo = r si done, o r + gamma * max(Q(s')) si not done
+        # Se evalúan todos los estados siguientes en una sola pasada por la red
+        # y la máscara `done` anula el término de arranque en los estados terminales.
+        if self.target_model is None:
+            next_q_max = self.model(next_state).max(dim=1)[0]
+        else:
+            with torch.no_grad():
+                next_q = self.target_model(next_state)
+                if DOUBLE_DQN:
+                    # Double DQN: la red en línea elige la mejor acción y la red objetivo la evalúa
+                    best_action = torch.argmax(self.model(next_state), dim=1, keepdim=True)
+                    next_q_max = next_q.gather(1, best_action).squeeze(1)
+                else:
+                    next_q_max = next_q.max(dim=1)[0]
+        Q_new = reward + self.gamma * next_q_max * (~done)
+
+        # El target para la acción tomada es el Q_nuevo (el resto se deja igual a la predicción)
         target = pred.clone()
-        for idx in range(len(done)):
-            Q_new = reward[idx]
-            if not done[idx]:
-                Q_new = reward[idx] + self.gamma * torch.max(self.model(next_state[idx]))
-            
-            # El target para la acción tomada es el Q_nuevo
-            target[idx][torch.argmax(action[idx]).item()] = Q_new
-            
+        target.scatter_(1, action.unsqueeze(1), Q_new.unsqueeze(1))
+
         # 3. Calcular la pérdida y optimizar
         self.optimizer.zero_grad()  # Limpiar gradientes anteriores
-        loss = self.criterion(target, pred) # Comparar Q-target con Q-predicción
+        if weights is None:
+            loss = self.criterion(target, pred) # Comparar Q-target con Q-predicción
+        else:
+            # Mismo error cuadrático medio, pero cada fila ponderada por su peso de importancia
+            loss = (weights.unsqueeze(1) * (target - pred) ** 2).mean()
         loss.backward() # Propagar el error hacia atrás (backpropagation)
         self.optimizer.step() # Actualizar los pesos del modelo
 
+        self.train_steps += 1
+        self.weights_version += 1
+        self.update_target()
+
+        td_errors = Q_new.detach() - pred.detach().gather(1, action.unsqueeze(1)).squeeze(1)
+
+        # Instrumentación: pérdida y Q-valores de la predicción
+        best_q = pred.detach().max(dim=1)[0]
+        stats = self._train_stats
+        stats['updates'] += 1
+        stats['samples'] += len(best_q)
+        stats['loss'] += loss.item()
+        stats['q_sum'] += best_q.sum().item()
+        stats['q_max'] = max(stats['q_max'], best_q.max().item())
+        stats['seconds'] += time.perf_counter() - start_time
+
+        return td_errors.abs().numpy()
+
+    def update_target(self):
+        """Actualiza la red objetivo según TARGET_UPDATE (copia periódica o promedio de Polyak)."""
+        if self.target_model is None:
+            return
+        if TARGET_UPDATE == 'hard':
+            if self.train_steps % TARGET_UPDATE_INTERVAL == 0:
+                self.target_model.load_state_dict(self.model.state_dict())
+        else:
+            # theta_objetivo = (1 - tau) * theta_objetivo + tau * theta
+            with torch.no_grad():
+                for target_param, param in zip(self.target_model.parameters(), self.model.parameters()):
+                    target_param.mul_(1 - TAU).add_(param, alpha=TAU)
+
+    def _current_table(self, n_actions=1):
+        """
+        Devuelve la tabla de consulta si está al día con los pesos, o None si las
+        `n_actions` acciones que se van a elegir deben usar la réplica en NumPy.
+        La tabla se recompila cuando los pesos llevan TABLE_COMPILE_AFTER acciones
+        sin cambiar (con actualizaciones en cada paso, nunca).
+        """
+        if self.table is None or self._table_version == self.weights_version:
+            return self.table
+        if self._stable_version != self.weights_version:
+            self._stable_version = self.weights_version
+            self._stable_actions = 0
+        self._stable_actions += n_actions
+        if self._stable_actions < TABLE_COMPILE_AFTER:
+            return None
+        self.table.compile(self.model)
+        self._table_version = self.weights_version
+        return self.table
+
     def get_action(self, state):
         """
         Decide una acción usando la estrategia épsilon-greedy.
@@ -142,15 +295,44 @@ class Agent:
         self.epsilon = 80 - self.n_games
         
         final_move = [0, 0, 0] # [recto, derecha, izquierda]
-        if random.randint(0, 200) < self.epsilon:
+        if self.rng.randint(0, 200) < self.epsilon:
             # Acción aleatoria (Exploración)
-            move_idx = random.randint(0, 2)
+            move_idx = self.rng.randint(0, 2)
             final_move[move_idx] = 1
         else:
             # Acción basada en el modelo (Explotación)
-            state_tensor = torch.tensor(state, dtype=torch.float)
-            prediction = self.model(state_tensor)
-            move_idx = torch.argmax(prediction).item()
+            table = self._current_table()
+            if table is not None:
+                move_idx = int(table.action(state))
+            elif self.fast_model is not None:
+                move_idx = int(np.argmax(self.fast_model(state)))
+            else:
+                state_tensor = torch.tensor(state, dtype=torch.float)
+                prediction = self.model(state_tensor)
+                move_idx = torch.argmax(prediction).item()
             final_move[move_idx] = 1
             
-        return final_move
\ No newline at end of file
+        return final_move
+
+    def get_actions(self, states):
+        """
+        Versión en lote de `get_action` con la misma estrategia épsilon-greedy.
+        Devuelve los índices de acción (0 recto, 1 derecha, 2 izquierda) de cada estado.
+        """
+        self.epsilon = 80 - self.n_games
+
+        # Explotación para todas las partidas con una sola pasada por la red
+        table = self._current_table(len(states))
+        if table is not None:
+            actions = table.action(states)
+        elif self.fast_model is not None:
+            actions = np.argmax(self.fast_model(states), axis=1)
+        else:
+            with torch.no_grad():
+                prediction = self.model(torch.as_tensor(states, dtype=torch.float))
+            actions = torch.argmax(prediction, dim=1).numpy()
+
+        # Exploración: misma probabilidad que random.randint(0, 200) < épsilon
+        explore = self.np_rng.integers(0, 201, size=len(actions)) < self.epsilon
+        actions[explore] = self.np_rng.integers(0, 3, size=int(explore.sum()))
+        return actions
\ No newline at end of file
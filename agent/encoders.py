@@ -0,0 +1,214 @@
+"""
+Registro de codificadores de observación: convierten el estado de una partida
+en el vector de características que recibe la red. El codificador elegido
+(OBSERVATION_ENCODER en config.py) fija también el tamaño de entrada de
+Linear_QNet y de la memoria de repetición.
+
+- 'basic': las 11 características binarias originales (ver agent/state.py).
+- 'rays': distancias a obstáculos y comida en 8 direcciones desde la cabeza.
+- 'window': ventana k x k de celdas bloqueadas alrededor de la cabeza.
+
+Las distancias y la cuadrícula de ocupación no se recalculan recorriendo el
+tablero en cada paso: se calculan una vez por partida y luego se actualizan
+con los eventos de ocupar/liberar celdas de SnakeGameAI.
+"""
+import numpy as np
+from snake_game.game import Direction
+from .state import get_state, get_states
+from config import OBSERVATION_ENCODER, WINDOW_SIZE
+
+ENCODERS = {}
+
+def register_encoder(name):
+    """Decorador que añade una clase de codificador al registro con el nombre `name`."""
+    def decorator(cls):
+        ENCODERS[name] = cls
+        cls.name = name
+        return cls
+    return decorator
+
+def make_encoder(name=OBSERVATION_ENCODER):
+    """Crea el codificador registrado con el nombre `name`."""
+    if name not in ENCODERS:
+        raise ValueError(f"Codificador desconocido {name!r}; opciones: {', '.join(ENCODERS)}")
+    return ENCODERS[name]()
+
+# Las 8 direcciones de los rayos (dx, dy), en sentido horario empezando por la derecha
+RAY_DIRECTIONS = [(1, 0), (1, 1), (0, 1), (-1, 1), (-1, 0), (-1, -1), (0, -1), (1, -1)]
+
+def _heading_and_food(game):
+    """Dirección actual (one-hot) y posición relativa de la comida, igual que en 'basic'."""
+    head = game.head
+    food = game.food if game.food is not None else head
+    return np.array([
+        game.direction == Direction.LEFT,
+        game.direction == Direction.RIGHT,
+        game.direction == Direction.UP,
+        game.direction == Direction.DOWN,
+        food.x < head.x,
+        food.x > head.x,
+        food.y < head.y,
+        food.y > head.y,
+    ], dtype=int)
+
+class OccupancyGrid:
+    """
+    Cuadrícula de celdas bloqueadas (serpiente o trampa) de una partida, con un
+    borde de `pad` celdas marcadas como pared. Se mantiene al día escuchando
+    los eventos `on_occupy`/`on_release` de SnakeGameAI.
+    """
+    def __init__(self, game, pad=1):
+        self.pad = pad
+        self.width, self.height = game.width, game.height
+        self.blocked = np.ones((game.height + 2 * pad, game.width + 2 * pad), dtype=np.bool_)
+        self.blocked[pad:pad + game.height, pad:pad + game.width] = True
+        for cell in game._free_cells:
+            self.blocked[cell.y + pad, cell.x + pad] = False
+        game.add_listener(self)
+
+    def on_occupy(self, pt):
+        self.blocked[pt.y + self.pad, pt.x + self.pad] = True
+
+    def on_release(self, pt):
+        self.blocked[pt.y + self.pad, pt.x + self.pad] = False
+
+class RayDistanceField(OccupancyGrid):
+    """
+    Para cada celda y cada una de las 8 direcciones, número de pasos hasta la
+    primera celda bloqueada o hasta salir del tablero (1 = la vecina ya está bloqueada).
+
+    Se calcula una vez por partida con un barrido por columnas (o filas) y después
+    se actualiza en O(1) operaciones de NumPy por evento: cuando una celda c cambia
+    de estado solo cambian las celdas detrás de ella en cada dirección, hasta el
+    primer obstáculo, y esa longitud es justo la distancia de c en la dirección opuesta.
+    """
+    def __init__(self, game):
+        super().__init__(game, pad=1)
+        self.dist = np.zeros((len(RAY_DIRECTIONS), self.height, self.width), dtype=np.int64)
+        for i, (dx, dy) in enumerate(RAY_DIRECTIONS):
+            self.dist[i] = self._sweep(dx, dy)
+
+    def _sweep(self, dx, dy):
+        """Distancias en la dirección (dx, dy) para todo el tablero, partiendo del borde."""
+        h, w = self.height, self.width
+        dist = np.zeros((h + 2, w + 2), dtype=np.int64)
+        if dx != 0:
+            # Barrido por columnas, empezando por la más cercana al borde hacia el que apunta el rayo
+            for x in (range(w, 0, -1) if dx > 0 else range(1, w + 1)):
+                ahead = slice(1 + dy, h + 1 + dy)
+                dist[1:-1, x] = np.where(self.blocked[ahead, x + dx], 1, 1 + dist[ahead, x + dx])
+        else:
+            for y in (range(h, 0, -1) if dy > 0 else range(1, h + 1)):
+                dist[y, 1:-1] = np.where(self.blocked[y + dy, 1:-1], 1, 1 + dist[y + dy, 1:-1])
+        return dist[1:-1, 1:-1]
+
+    def _update(self, pt, blocked):
+        for i, (dx, dy) in enumerate(RAY_DIRECTIONS):
+            # Celdas detrás de `pt` (en la dirección opuesta) hasta el primer obstáculo incluido
+            opposite = (i + 4) % 8
+            k = np.arange(1, self.dist[opposite, pt.y, pt.x] + 1)
+            xs, ys = pt.x - k * dx, pt.y - k * dy
+            inside = (xs >= 0) & (xs < self.width) & (ys >= 0) & (ys < self.height)
+            k, xs, ys = k[inside], xs[inside], ys[inside]
+            # Si `pt` se bloquea, su rayo se corta en ella; si se libera, el rayo sigue a través de ella
+            self.dist[i, ys, xs] = k if blocked else k + self.dist[i, pt.y, pt.x]
+
+    def on_occupy(self, pt):
+        super().on_occupy(pt)
+        self._update(pt, True)
+
+    def on_release(self, pt):
+        super().on_release(pt)
+        self._update(pt, False)
+
+class _GameEncoder:
+    """Base de los codificadores que mantienen una estructura por partida (se rehace al cambiar de partida)."""
+    binary = False
+    batched = False  # Solo 'basic' codifica un VecSnakeEnv completo (`encode_batch`)
+
+    def __init__(self):
+        self._game = None
+        self._board = None
+
+    def _board_for(self, game):
+        if game is not self._game:
+            self._game = game
+            self._board = self._build(game)
+        return self._board
+
+@register_encoder('basic')
+class BasicEncoder:
+    """Las 11 características binarias originales: peligro a un paso, dirección y comida."""
+    size = 11
+    binary = True
+    batched = True
+
+    def encode(self, game):
+        return get_state(game)
+
+    def encode_batch(self, env):
+        return get_states(env)
+
+@register_encoder('rays')
+class RayEncoder(_GameEncoder):
+    """
+    8 rayos desde la cabeza: inversa de la distancia al primer obstáculo (pared,
+    cuerpo o trampa) y, si la comida está en el rayo antes del obstáculo, la
+    inversa de su distancia. Más la dirección actual y la posición relativa de la comida.
+    """
+    size = 2 * len(RAY_DIRECTIONS) + 8
+
+    def _build(self, game):
+        return RayDistanceField(game)
+
+    def encode(self, game):
+        field = self._board_for(game)
+        head = game.head
+        if game._is_out_of_bounds(head):
+            # La partida acaba de terminar contra la pared: no hay rayos que medir
+            return np.concatenate([np.ones(len(RAY_DIRECTIONS)), np.zeros(len(RAY_DIRECTIONS)),
+                                   _heading_and_food(game)]).astype(np.float32)
+        obstacle = field.dist[:, head.y, head.x]
+
+        food_rays = np.zeros(len(RAY_DIRECTIONS))
+        if game.food is not None:
+            fx, fy = game.food.x - head.x, game.food.y - head.y
+            k = max(abs(fx), abs(fy), 1)
+            step = (fx // k, fy // k)
+            # La comida está en un rayo si el desplazamiento es un múltiplo exacto de su dirección
+            if step in RAY_DIRECTIONS and (step[0] * k, step[1] * k) == (fx, fy):
+                i = RAY_DIRECTIONS.index(step)
+                if k < obstacle[i]:
+                    food_rays[i] = 1 / k
+
+        return np.concatenate([1 / obstacle, food_rays, _heading_and_food(game)]).astype(np.float32)
+
+@register_encoder('window')
+class WindowEncoder(_GameEncoder):
+    """
+    Ventana de WINDOW_SIZE x WINDOW_SIZE celdas centrada en la cabeza (1 = pared,
+    cuerpo o trampa), más la dirección actual y la posición relativa de la comida.
+    """
+    binary = True
+
+    def __init__(self, window=WINDOW_SIZE):
+        super().__init__()
+        # Con un lado par la ventana no tendría centro y quedaría desplazada respecto a la cabeza
+        if window <= 0 or window % 2 == 0:
+            raise ValueError(f"El lado de la ventana debe ser impar y positivo, no {window}")
+        self.window = window
+        self.size = window * window + 8
+
+    def _build(self, game):
+        return OccupancyGrid(game, pad=self.window // 2)
+
+    def encode(self, game):
+        grid = self._board_for(game)
+        head = game.head
+        if game._is_out_of_bounds(head):
+            # La partida acaba de terminar contra la pared: ventana totalmente bloqueada
+            view = np.ones((self.window, self.window), dtype=np.bool_)
+        else:
+            # Con el borde de `pad` celdas, la ventana empieza justo en la posición de la cabeza
+            view = grid.blocked[head.y:head.y + self.window, head.x:head.x + self.window]
+        return np.concatenate([view.ravel(), _heading_and_food(game)]).astype(int)
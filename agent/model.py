@@ -1,3 +1,4 @@
+import numpy as np
 import torch
 import torch.nn as nn
 import torch.nn.functional as F
@@ -9,11 +10,11 @@ class Linear_QNet(nn.Module):
     Red Neuronal para aproximar la función Q.
     Es una red feed-forward simple con una capa oculta.
     """
-    def __init__(self):
+    def __init__(self, input_size=INPUT_SIZE):
         super().__init__()
         # Definimos las capas. Las dimensiones se importan desde config.py para modularidad.
-        # Capa de entrada (tamaño del estado) a capa oculta.
-        self.linear1 = nn.Linear(INPUT_SIZE, HIDDEN_SIZE)
+        # Capa de entrada (tamaño del estado, que depende del codificador de observaciones) a capa oculta.
+        self.linear1 = nn.Linear(input_size, HIDDEN_SIZE)
         # Capa oculta a capa de salida (número de acciones).
         self.linear2 = nn.Linear(HIDDEN_SIZE, OUTPUT_SIZE)
 
@@ -28,9 +29,10 @@ class Linear_QNet(nn.Module):
         x = self.linear2(x)
         return x
 
-    def save(self, file_name='model.pth'):
+    def save(self, file_name='model.pth', target_model=None):
         """
         Guarda el estado del modelo en un archivo.
+        Si se pasa `target_model`, el archivo incluye también los pesos de la red objetivo.
         """
         # Asegurarse de que la carpeta de modelos exista
         if not os.path.exists(MODEL_FOLDER_PATH):
@@ -40,4 +42,91 @@ class Linear_QNet(nn.Module):
         
         # Guardamos solo el state_dict, que contiene los pesos y sesgos aprendidos.
         # Es la forma recomendada y más portable.
-        torch.save(self.state_dict(), file_path)
\ No newline at end of file
+        if target_model is None:
+            torch.save(self.state_dict(), file_path)
+        else:
+            torch.save({'model': self.state_dict(), 'target_model': target_model.state_dict()}, file_path)
+
+    @staticmethod
+    def load_state_dicts(file_path):
+        """
+        Lee un archivo escrito por `save` (con o sin red objetivo).
+        Devuelve (state_dict del modelo, state_dict de la red objetivo o None).
+        """
+        checkpoint = torch.load(file_path, map_location=torch.device('cpu'))
+        if 'model' in checkpoint:
+            return checkpoint['model'], checkpoint.get('target_model')
+        return checkpoint, None
+
+class NumpyQNet:
+    """
+    Réplica en NumPy del forward de Linear_QNet para elegir acciones sin pasar por
+    PyTorch. Para una red tan pequeña (11 -> 256 -> 3) el coste de despachar
+    operaciones de PyTorch es mucho mayor que la aritmética en sí.
+
+    Los arrays son vistas de los parámetros del modelo (comparten memoria), así
+    que reflejan cualquier actualización in-place del optimizador o de
+    `load_state_dict`; solo hace falta volver a llamar a `sync` si los tensores
+    de parámetros se sustituyen por otros.
+    """
+    def __init__(self, model):
+        self.sync(model)
+
+    def sync(self, model):
+        self.w1 = model.linear1.weight.detach().numpy().T
+        self.b1 = model.linear1.bias.detach().numpy()
+        self.w2 = model.linear2.weight.detach().numpy().T
+        self.b2 = model.linear2.bias.detach().numpy()
+
+    def forward(self, x):
+        """Q-valores de un estado (forma (11,)) o de un lote de estados (forma (N, 11))."""
+        x = np.asarray(x, dtype=np.float32)
+        hidden = np.maximum(x @ self.w1 + self.b1, 0)  # ReLU
+        return hidden @ self.w2 + self.b2
+
+    __call__ = forward
+
+def binary_states(n_features=INPUT_SIZE):
+    """Los 2^n estados binarios posibles; la fila i es el estado cuyos bits empaquetados valen i."""
+    return (np.arange(2 ** n_features)[:, None] >> np.arange(n_features)) & 1
+
+class QTable:
+    """
+    Tabla de consulta con los Q-valores y la acción greedy de cada uno de los
+    2^11 estados binarios posibles, compilada a partir de un Linear_QNet.
+    Un estado se convierte en índice empaquetando sus bits (`state @ [1, 2, 4, ...]`),
+    así que elegir una acción es una sola indexación de un array.
+
+    Solo es válida para estados de características binarias (como los de
+    `get_state`) y es una foto de los pesos: si el modelo cambia hay que
+    volver a llamar a `compile`.
+    """
+    MAX_FEATURES = 16  # 2^16 filas como máximo
+
+    def __init__(self, model):
+        n_features = model.linear1.in_features
+        if n_features > self.MAX_FEATURES:
+            raise ValueError(f"QTable admite como máximo {self.MAX_FEATURES} características binarias, no {n_features}")
+        self.bits = 1 << np.arange(n_features)
+        self.states = binary_states(n_features)
+        self.compile(model)
+
+    def compile(self, model):
+        """Recalcula la tabla con los pesos actuales de `model` (una pasada de 2^n estados)."""
+        with torch.no_grad():
+            self.q_values = model(torch.as_tensor(self.states, dtype=torch.float)).numpy()
+        self.actions = self.q_values.argmax(axis=-1)
+
+    def index(self, state):
+        """Índice (o índices, para un lote) de la tabla que corresponde a los estados binarios."""
+        return np.asarray(state).astype(np.int64) @ self.bits
+
+    def forward(self, state):
+        """Q-valores de un estado o lote de estados, con la misma interfaz que NumpyQNet."""
+        return self.q_values[self.index(state)]
+
+    __call__ = forward
+
+    def action(self, state):
+        """Índice de la acción greedy (0 recto, 1 derecha, 2 izquierda) de un estado o lote."""
+        return self.actions[self.index(state)]
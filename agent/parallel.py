@@ -0,0 +1,186 @@
+import queue
+import random
+import time
+import numpy as np
+import torch
+import torch.multiprocessing as mp
+from snake_game.game import SnakeGameAI
+from .model import Linear_QNet
+from .policy import GreedyPolicy
+from .encoders import make_encoder
+from utils.seeding import derive_seed, seed_everything
+from config import ACTOR_FLUSH_STEPS, ACTOR_QUEUE_SIZE, ACTOR_POLL_SECONDS, ACTION_BACKEND
+
+def _actor_epsilon(n_games):
+    """Épsilon de los actores tras `n_games` partidas (el mismo decaimiento que Agent.get_action)."""
+    return 80 - n_games
+
+def _actor_loop(worker_id, shared_model, weights_version, n_games, transitions, stop_event, game_kwargs, seed):
+    """
+    Bucle de un actor: juega partidas con su propia copia de la red y envía las
+    transiciones al aprendiz en bloques de arrays de NumPy.
+    El actor no entrena: usa una GreedyPolicy (sin optimizador ni memoria de
+    repetición) y su propio generador para la exploración épsilon-greedy.
+    """
+    # Cada actor usa un solo hilo; el paralelismo viene de tener varios procesos
+    torch.set_num_threads(1)
+    # Semilla propia de cada actor, derivada de la semilla base
+    worker_seed = derive_seed(seed, 'worker', worker_id)
+    seed_everything(worker_seed)
+    rng = random.Random(derive_seed(worker_seed, 'agent'))
+    model = Linear_QNet(shared_model.linear1.in_features)
+    policy = None
+    local_version = -1
+
+    states, actions, rewards, next_states, dones, scores = [], [], [], [], [], []
+
+    def flush():
+        if not actions:
+            return
+        # La cola está acotada: si el aprendiz va atrasado, el actor espera aquí
+        transitions.put((
+            worker_id,
+            np.array(states, dtype=np.float32),
+            np.array(actions, dtype=np.int64),
+            np.array(rewards, dtype=np.float32),
+            np.array(next_states, dtype=np.float32),
+            np.array(dones, dtype=np.bool_),
+            list(scores),
+        ))
+        for column in (states, actions, rewards, next_states, dones, scores):
+            column.clear()
+
+    episode = 0
+    game = SnakeGameAI(**game_kwargs, seed=derive_seed(worker_seed, 'game', episode))
+    encoder = make_encoder()
+    state_old = encoder.encode(game)
+    while not stop_event.is_set():
+        # Sincronizar los pesos si el aprendiz publicó una versión nueva
+        if weights_version.value != local_version:
+            with weights_version.get_lock():
+                local_version = weights_version.value
+                model.load_state_dict(shared_model.state_dict())
+            policy = GreedyPolicy(model, backend=ACTION_BACKEND, encoder=encoder)
+
+        # Épsilon-greedy como en Agent.get_action; el épsilon depende de las partidas globales jugadas
+        if rng.randint(0, 200) < _actor_epsilon(n_games.value):
+            move_idx = rng.randint(0, 2)
+        else:
+            move_idx = int(np.argmax(policy.get_action(state_old)))
+        final_move = [0, 0, 0]
+        final_move[move_idx] = 1
+
+        reward, done, score = game.play_step(final_move)
+        state_new = encoder.encode(game)
+
+        states.append(state_old)
+        actions.append(move_idx)
+        rewards.append(reward)
+        next_states.append(state_new)
+        dones.append(done)
+
+        if done:
+            scores.append(score)
+            episode += 1
+            game = SnakeGameAI(**game_kwargs, seed=derive_seed(worker_seed, 'game', episode))
+            state_new = encoder.encode(game)
+            flush()
+        elif len(actions) >= ACTOR_FLUSH_STEPS:
+            # Partidas muy largas: no esperar al final para enviar experiencia
+            flush()
+        state_old = state_new
+
+    flush()
+
+class ParallelRollout:
+    """
+    Gestiona un grupo de procesos actores que recolectan experiencia en paralelo.
+    El aprendiz (proceso principal) publica sus pesos en un modelo en memoria
+    compartida con `sync_weights` y recibe las transiciones con `get`.
+    Con `seed`, cada actor juega con una semilla derivada de ella y de su id; el
+    orden en que llegan los bloques al aprendiz sigue dependiendo del planificador.
+    """
+    def __init__(self, num_workers, game_kwargs, seed=None):
+        self.num_workers = num_workers
+        self.game_kwargs = game_kwargs
+        self.seed = seed
+
+        ctx = mp.get_context('spawn')
+        self.shared_model = Linear_QNet(make_encoder().size)
+        self.shared_model.share_memory()
+        self.weights_version = ctx.Value('i', 0)
+        self.n_games = ctx.Value('i', 0)
+        self.transitions = ctx.Queue(maxsize=ACTOR_QUEUE_SIZE)
+        self.stop_event = ctx.Event()
+        self.processes = [
+            ctx.Process(
+                target=_actor_loop,
+                args=(i, self.shared_model, self.weights_version, self.n_games,
+                      self.transitions, self.stop_event, game_kwargs, seed),
+                daemon=True,
+            )
+            for i in range(num_workers)
+        ]
+
+    def start(self, model, n_games=0):
+        """Publica los pesos iniciales y lanza los actores."""
+        self.sync_weights(model, n_games)
+        for p in self.processes:
+            p.start()
+
+    def sync_weights(self, model, n_games):
+        """Copia los pesos del aprendiz al modelo compartido que leen los actores."""
+        with self.weights_version.get_lock():
+            self.shared_model.load_state_dict(model.state_dict())
+            self.weights_version.value += 1
+        self.n_games.value = n_games
+
+    @property
+    def epsilon(self):
+        """Épsilon con el que exploran ahora los actores (según las partidas de la última sincronización)."""
+        return _actor_epsilon(self.n_games.value)
+
+    def get(self, timeout=None):
+        """
+        Devuelve el siguiente bloque de transiciones:
+        (states, actions, rewards, next_states, dones, finished_scores).
+        Mientras espera comprueba cada ACTOR_POLL_SECONDS que los actores sigan
+        vivos: si alguno terminó, lanza RuntimeError en lugar de esperar para siempre.
+        Con `timeout` (segundos), lanza queue.Empty si no llega nada a tiempo.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait = ACTOR_POLL_SECONDS
+            if deadline is not None:
+                wait = min(wait, max(0, deadline - time.monotonic()))
+            try:
+                return self.transitions.get(timeout=wait)[1:]
+            except queue.Empty:
+                self._check_actors()
+                if deadline is not None and time.monotonic() >= deadline:
+                    raise
+
+    def _check_actors(self):
+        """Lanza RuntimeError si algún actor terminó antes de `close`."""
+        if self.stop_event.is_set():
+            return
+        dead = [(i, p.exitcode) for i, p in enumerate(self.processes) if p.exitcode is not None]
+        if dead:
+            details = ', '.join(f'actor {i} (código {code})' for i, code in dead)
+            raise RuntimeError(f"Los actores terminaron inesperadamente: {details}")
+
+    def close(self):
+        """
+        Detiene los actores y vacía la cola para que puedan terminar (un actor
+        bloqueado en `put` con la cola llena solo ve `stop_event` cuando hay sitio).
+        """
+        self.stop_event.set()
+        for p in self.processes:
+            while p.is_alive():
+                # Se vacía todo lo que haya en la cola, no un bloque por vuelta
+                try:
+                    while True:
+                        self.transitions.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+                p.join(timeout=0.1)
@@ -0,0 +1,78 @@
+import numpy as np
+import torch
+from .model import Linear_QNet, NumpyQNet, QTable
+from .encoders import make_encoder
+from config import INFERENCE_BACKEND
+
+class GreedyPolicy:
+    """
+    Política de solo inferencia para jugar con un modelo ya entrenado.
+    A diferencia de Agent, no crea optimizador, función de pérdida ni memoria
+    de repetición: solo la red y el codificador de estado.
+
+    Backends disponibles para el forward:
+    - 'numpy': dos productos matriciales en NumPy (el más rápido por jugada en CPU).
+    - 'torch': el propio Linear_QNet bajo `torch.inference_mode()`.
+    - 'script': el modelo trazado con TorchScript, también bajo `inference_mode`.
+    - 'table': tabla con la acción de cada uno de los 2^11 estados, compilada al
+      crear la política (ver QTable); elegir una acción es una sola indexación.
+    """
+    BACKENDS = ('numpy', 'torch', 'script', 'table')
+
+    def __init__(self, model, backend=INFERENCE_BACKEND, encoder=None):
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Backend desconocido {backend!r}; opciones: {', '.join(self.BACKENDS)}")
+        self.backend = backend
+        self.model = model.eval()
+
+        # El codificador debe producir tantas características como entradas tiene el modelo
+        self.encoder = encoder or make_encoder()
+        if self.encoder.size != model.linear1.in_features:
+            raise ValueError(f"El modelo espera {model.linear1.in_features} entradas, pero el codificador "
+                             f"{self.encoder.name!r} produce {self.encoder.size}")
+
+        if backend == 'table' and not self.encoder.binary:
+            raise ValueError(f"El backend 'table' requiere un codificador binario, no {self.encoder.name!r}")
+
+        if backend == 'numpy':
+            self._forward = NumpyQNet(self.model)
+        elif backend == 'table':
+            self._forward = QTable(self.model)
+        elif backend == 'script':
+            example = torch.zeros(1, self.model.linear1.in_features)
+            with torch.no_grad():
+                self._forward = torch.jit.trace(self.model, example)
+        else:
+            self._forward = self.model
+
+    @classmethod
+    def load(cls, model_path, backend=INFERENCE_BACKEND):
+        """
+        Crea la política a partir de un archivo guardado con `Linear_QNet.save`.
+        Lanza FileNotFoundError si el archivo no existe.
+        """
+        state_dict, _ = Linear_QNet.load_state_dicts(model_path)
+        # El tamaño de entrada se lee de los pesos guardados
+        model = Linear_QNet(state_dict['linear1.weight'].shape[1])
+        model.load_state_dict(state_dict)
+        return cls(model, backend=backend)
+
+    def get_state(self, game):
+        """Vector de estado con el codificador configurado (el mismo que usa Agent)."""
+        return self.encoder.encode(game)
+
+    def q_values(self, state):
+        """Q-valores de un estado (o lote de estados) como array de NumPy."""
+        if self.backend in ('numpy', 'table'):
+            return self._forward(state)
+        with torch.inference_mode():
+            return self._forward(torch.as_tensor(np.asarray(state), dtype=torch.float)).numpy()
+
+    def get_action(self, state):
+        """Acción greedy en formato one-hot [recto, derecha, izquierda], como Agent.get_action."""
+        final_move = [0, 0, 0]
+        if self.backend == 'table':
+            final_move[int(self._forward.action(state))] = 1
+        else:
+            final_move[int(np.argmax(self.q_values(state)))] = 1
+        return final_move
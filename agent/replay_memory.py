@@ -0,0 +1,243 @@
+import json
+import os
+import numpy as np
+import torch
+from config import INPUT_SIZE, PER_ALPHA, PER_BETA_START, PER_BETA_STEPS, PER_EPS
+
+class ReplayMemory:
+    """
+    Memoria de repetición implementada como un buffer circular.
+    Cada campo de la transición (s, a, r, s', done) vive en una columna NumPy
+    contigua y preasignada, de modo que insertar es O(1) y muestrear un lote
+    es una sola indexación vectorizada, sin tuplas ni re-apilado en cada llamada.
+    """
+    def __init__(self, capacity, state_size=INPUT_SIZE, seed=None):
+        self.capacity = capacity
+        self.state_size = state_size
+
+        # Columnas preasignadas (la acción se guarda como índice: 0 recto, 1 derecha, 2 izquierda)
+        self.states = np.zeros((capacity, state_size), dtype=np.float32)
+        self.actions = np.zeros(capacity, dtype=np.int64)
+        self.rewards = np.zeros(capacity, dtype=np.float32)
+        self.next_states = np.zeros((capacity, state_size), dtype=np.float32)
+        self.dones = np.zeros(capacity, dtype=np.bool_)
+
+        self.position = 0  # Siguiente posición a sobrescribir
+        self.size = 0      # Número de transiciones válidas almacenadas
+        self.rng = np.random.default_rng(seed)
+
+    def __len__(self):
+        return self.size
+
+    def push(self, state, action, reward, next_state, done):
+        """Almacena una transición, sobrescribiendo la más antigua si el buffer está lleno."""
+        i = self.position
+        self.states[i] = state
+        self.actions[i] = action
+        self.rewards[i] = reward
+        self.next_states[i] = next_state
+        self.dones[i] = done
+
+        self.position = (i + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+    def push_batch(self, states, actions, rewards, next_states, dones):
+        """Almacena un lote de transiciones con una sola escritura vectorizada."""
+        n = len(actions)
+        if n == 0:
+            return
+        if n > self.capacity:
+            # Solo las últimas `capacity` transiciones sobrevivirían de todas formas
+            states, actions, rewards = states[-self.capacity:], actions[-self.capacity:], rewards[-self.capacity:]
+            next_states, dones = next_states[-self.capacity:], dones[-self.capacity:]
+            n = self.capacity
+
+        idx = (self.position + np.arange(n)) % self.capacity
+        self.states[idx] = states
+        self.actions[idx] = actions
+        self.rewards[idx] = rewards
+        self.next_states[idx] = next_states
+        self.dones[idx] = dones
+
+        self.position = (self.position + n) % self.capacity
+        self.size = min(self.size + n, self.capacity)
+
+    def sample(self, batch_size):
+        """
+        Devuelve un lote aleatorio (sin reemplazo) como tensores de PyTorch listos
+        para `Agent.train_step`. Si hay menos transiciones que `batch_size`, usa todas.
+        """
+        return self.sample_weighted(batch_size)[0]
+
+    def sample_weighted(self, batch_size):
+        """
+        Interfaz común con PrioritizedReplayMemory: devuelve (lote, índices, pesos).
+        En la memoria uniforme no hay pesos de importancia (None).
+        """
+        if self.size > batch_size:
+            idx = self.rng.choice(self.size, size=batch_size, replace=False)
+        else:
+            idx = np.arange(self.size)
+        return self._gather(idx), idx, None
+
+    def update_priorities(self, idx, td_errors):
+        """La memoria uniforme no usa prioridades."""
+
+    # Columnas que se guardan en disco, una por archivo .npy
+    COLUMNS = ('states', 'actions', 'rewards', 'next_states', 'dones')
+
+    def save(self, folder):
+        """
+        Guarda el contenido como un archivo .npy por columna (más un pequeño JSON
+        con los contadores). Los .npy se pueden abrir con `mmap_mode` sin deserializar nada.
+        """
+        os.makedirs(folder, exist_ok=True)
+        for name in self.COLUMNS:
+            np.save(os.path.join(folder, f'{name}.npy'), getattr(self, name)[:self.size])
+        with open(os.path.join(folder, 'memory.json'), 'w') as f:
+            json.dump(self._meta(), f)
+
+    def load(self, folder):
+        """Carga una memoria guardada con `save` sobre las columnas preasignadas."""
+        with open(os.path.join(folder, 'memory.json')) as f:
+            meta = json.load(f)
+        size = min(meta['size'], self.capacity)
+        for name in self.COLUMNS:
+            # Lectura mapeada en memoria: se copia directamente al buffer, sin objetos intermedios
+            data = np.load(os.path.join(folder, f'{name}.npy'), mmap_mode='r')
+            getattr(self, name)[:size] = data[:size]
+        self.size = size
+        self.position = meta['position'] % self.capacity
+        self._load_meta(meta)
+
+    def _meta(self):
+        return {'size': self.size, 'position': self.position, 'capacity': self.capacity}
+
+    def _load_meta(self, meta):
+        """Gancho para que las subclases restauren su propio estado."""
+
+    def _gather(self, idx):
+        # La indexación avanzada produce una copia contigua; `from_numpy` la comparte sin copiar otra vez
+        return (
+            torch.from_numpy(self.states[idx]),
+            torch.from_numpy(self.actions[idx]),
+            torch.from_numpy(self.rewards[idx]),
+            torch.from_numpy(self.next_states[idx]),
+            torch.from_numpy(self.dones[idx]),
+        )
+
+class SumTree:
+    """
+    Árbol binario de sumas guardado en un array: las hojas son las prioridades
+    y cada nodo interno la suma de sus dos hijos. La raíz (índice 1) es la suma
+    total. Actualizar y buscar son O(log n) y se hacen para todo un lote a la vez.
+    """
+    def __init__(self, capacity):
+        # Número de hojas redondeado a una potencia de 2 para que todas estén en el mismo nivel
+        self.leaf_count = 1 << max(capacity - 1, 1).bit_length()
+        self.tree = np.zeros(2 * self.leaf_count, dtype=np.float64)
+
+    def total(self):
+        return self.tree[1]
+
+    def get(self, idx):
+        return self.tree[np.asarray(idx) + self.leaf_count]
+
+    def update(self, idx, priorities):
+        """Asigna prioridades a las hojas `idx` y recalcula las sumas de sus ancestros."""
+        nodes = np.asarray(idx, dtype=np.int64) + self.leaf_count
+        self.tree[nodes] = priorities
+        nodes = np.unique(nodes // 2)
+        while True:
+            self.tree[nodes] = self.tree[2 * nodes] + self.tree[2 * nodes + 1]
+            if nodes[0] == 1:
+                break
+            nodes = np.unique(nodes // 2)
+
+    def find(self, values):
+        """Para cada valor en [0, total) devuelve la hoja cuya suma acumulada lo contiene."""
+        values = np.array(values, dtype=np.float64)
+        nodes = np.ones(len(values), dtype=np.int64)
+        while nodes[0] < self.leaf_count:
+            left = 2 * nodes
+            left_sum = self.tree[left]
+            go_right = values > left_sum
+            values = np.where(go_right, values - left_sum, values)
+            nodes = np.where(go_right, left + 1, left)
+        return nodes - self.leaf_count
+
+class PrioritizedReplayMemory(ReplayMemory):
+    """
+    Memoria de repetición con muestreo prioritario (Prioritized Experience Replay).
+    Cada transición se muestrea con probabilidad proporcional a p^alpha, donde p es
+    su último error TD. Las transiciones nuevas entran con la prioridad máxima vista.
+    Los pesos de muestreo por importancia (con beta creciendo hasta 1) corrigen el sesgo.
+    """
+    def __init__(self, capacity, state_size=INPUT_SIZE, seed=None, alpha=PER_ALPHA,
+                 beta_start=PER_BETA_START, beta_steps=PER_BETA_STEPS, eps=PER_EPS):
+        super().__init__(capacity, state_size, seed)
+        self.tree = SumTree(capacity)
+        self.alpha = alpha
+        self.beta = beta_start
+        self.beta_increment = (1.0 - beta_start) / beta_steps
+        self.eps = eps
+        self.max_priority = 1.0
+
+    def push(self, state, action, reward, next_state, done):
+        i = self.position
+        super().push(state, action, reward, next_state, done)
+        self.tree.update([i], self.max_priority ** self.alpha)
+
+    def push_batch(self, states, actions, rewards, next_states, dones):
+        n = min(len(actions), self.capacity)
+        if n == 0:
+            return
+        super().push_batch(states, actions, rewards, next_states, dones)
+        # Posiciones que acaban de escribirse (las n anteriores a la posición actual)
+        idx = (self.position - n + np.arange(n)) % self.capacity
+        self.tree.update(idx, self.max_priority ** self.alpha)
+
+    def sample_weighted(self, batch_size):
+        """
+        Muestreo estratificado: el rango [0, total) se divide en `batch_size`
+        segmentos y se toma un valor uniforme en cada uno.
+        Devuelve (lote, índices, pesos de importancia como tensor).
+        """
+        n = min(batch_size, self.size)
+        total = self.tree.total()
+        segment = total / n
+        values = (np.arange(n) + self.rng.random(n)) * segment
+        idx = np.minimum(self.tree.find(values), self.size - 1)
+
+        # w_i = (N * P(i))^-beta, normalizados por el máximo para que solo reduzcan el paso
+        probs = self.tree.get(idx) / total
+        weights = (self.size * probs) ** (-self.beta)
+        weights /= weights.max()
+        self.beta = min(1.0, self.beta + self.beta_increment)
+
+        return self._gather(idx), idx, torch.from_numpy(weights.astype(np.float32))
+
+    def save(self, folder):
+        super().save(folder)
+        np.save(os.path.join(folder, 'priorities.npy'), self.tree.get(np.arange(self.size)))
+
+    def load(self, folder):
+        super().load(folder)
+        priorities = np.load(os.path.join(folder, 'priorities.npy'), mmap_mode='r')
+        if self.size > 0:
+            self.tree.update(np.arange(self.size), priorities[:self.size])
+
+    def _meta(self):
+        meta = super()._meta()
+        meta.update(beta=self.beta, max_priority=self.max_priority)
+        return meta
+
+    def _load_meta(self, meta):
+        self.beta = meta.get('beta', self.beta)
+        self.max_priority = meta.get('max_priority', self.max_priority)
+
+    def update_priorities(self, idx, td_errors):
+        """Actualiza las prioridades de las transiciones muestreadas con sus nuevos errores TD."""
+        priorities = np.abs(td_errors) + self.eps
+        self.max_priority = max(self.max_priority, float(priorities.max()))
+        self.tree.update(idx, priorities ** self.alpha)
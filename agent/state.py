@@ -0,0 +1,96 @@
+"""
+Codificación del estado del juego que recibe la red: 11 valores binarios
+(peligro recto/derecha/izquierda, dirección actual y ubicación de la comida).
+Se usa tanto al entrenar (Agent) como al jugar con un modelo ya entrenado (GreedyPolicy).
+"""
+import numpy as np
+from snake_game.game import SnakeGameAI, Direction, Point
+from snake_game.vec_env import VecSnakeEnv, DIR_DX, DIR_DY
+
+def get_state(game: SnakeGameAI):
+    """
+    Construye el vector de estado de 11 elementos a partir del juego.
+    """
+    head = game.head
+    # Sin comida (tablero lleno) las cuatro señales de comida quedan en falso
+    food = game.food if game.food is not None else head
+
+    # Celdas vecinas para comprobar colisiones
+    point_l = Point(head.x - 1, head.y)
+    point_r = Point(head.x + 1, head.y)
+    point_u = Point(head.x, head.y - 1)
+    point_d = Point(head.x, head.y + 1)
+
+    # Dirección actual (one-hot encoded)
+    dir_l = game.direction == Direction.LEFT
+    dir_r = game.direction == Direction.RIGHT
+    dir_u = game.direction == Direction.UP
+    dir_d = game.direction == Direction.DOWN
+
+    state = [
+        # Peligro inmediato (recto, derecha, izquierda)
+        # Peligro recto
+        (dir_r and game._is_collision(point_r)) or 
+        (dir_l and game._is_collision(point_l)) or 
+        (dir_u and game._is_collision(point_u)) or 
+        (dir_d and game._is_collision(point_d)),
+
+        # Peligro a la derecha (relativo a la dirección actual)
+        (dir_u and game._is_collision(point_r)) or 
+        (dir_d and game._is_collision(point_l)) or 
+        (dir_l and game._is_collision(point_u)) or 
+        (dir_r and game._is_collision(point_d)),
+
+        # Peligro a la izquierda (relativo a la dirección actual)
+        (dir_d and game._is_collision(point_r)) or 
+        (dir_u and game._is_collision(point_l)) or 
+        (dir_r and game._is_collision(point_u)) or 
+        (dir_l and game._is_collision(point_d)),
+
+        # Dirección del movimiento
+        dir_l,
+        dir_r,
+        dir_u,
+        dir_d,
+
+        # Ubicación de la comida
+        food.x < head.x,  # Comida a la izquierda
+        food.x > head.x,  # Comida a la derecha
+        food.y < head.y,  # Comida arriba
+        food.y > head.y   # Comida abajo
+    ]
+
+    return np.array(state, dtype=int)
+
+def get_states(env: VecSnakeEnv):
+    """
+    Versión en lote de `get_state`: construye los mismos 11 elementos para
+    todas las partidas de un VecSnakeEnv a la vez, directamente desde sus
+    arrays. Devuelve un array de forma (N, 11).
+    """
+    d = env.direction  # Códigos en sentido horario: 0 derecha, 1 abajo, 2 izquierda, 3 arriba
+    hx, hy = env.head_x, env.head_y
+
+    # Peligro recto, a la derecha y a la izquierda (relativo a la dirección actual)
+    dangers = [env.is_blocked(hx + DIR_DX[turn], hy + DIR_DY[turn])
+               for turn in (d, (d + 1) % 4, (d - 1) % 4)]
+
+    # Ubicación de la comida (sin comida, las cuatro señales quedan en falso)
+    has_food = env.food >= 0
+    fx = np.where(has_food, env.food % env.cols, hx)
+    fy = np.where(has_food, env.food // env.cols, hy)
+
+    state = np.stack([
+        *dangers,
+        # Dirección del movimiento (mismo orden que get_state: izquierda, derecha, arriba, abajo)
+        d == 2,
+        d == 0,
+        d == 3,
+        d == 1,
+        fx < hx,  # Comida a la izquierda
+        fx > hx,  # Comida a la derecha
+        fy < hy,  # Comida arriba
+        fy > hy,  # Comida abajo
+    ], axis=1)
+
+    return state.astype(int)
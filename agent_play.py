@@ -1,49 +1,40 @@
+import argparse
 import pygame
-import torch
 import os
 
 # Importaciones de nuestro proyecto
-from agent.dql_agent import Agent
+from agent.policy import GreedyPolicy
 from snake_game.game import SnakeGameAI
 from snake_game.menu import run_setup_menu
+from snake_game.recording import EpisodeRecorder
+from snake_game.render import GameRenderer
 from config import (
-    SCREEN_WIDTH, SCREEN_HEIGHT, MODEL_FOLDER_PATH, MODEL_FILE_NAME
+    SCREEN_WIDTH, SCREEN_HEIGHT, BOARD_WIDTH, BOARD_HEIGHT, MODEL_FOLDER_PATH, MODEL_FILE_NAME, RECORD_FILE_PATH
 )
 
 # Velocidad a la que jugará el agente para que sea observable
 GAME_SPEED_PLAYBACK = 20
 
-def play():
+def play(record=None):
     """
     Carga un agente entrenado y lo hace jugar en un tablero
-    configurado por el usuario.
+    configurado por el usuario. Con `record` (ruta de archivo) se graba la partida.
     """
     # --- Carga del Modelo Entrenado ---
     model_path = os.path.join(MODEL_FOLDER_PATH, MODEL_FILE_NAME)
     
     # 1. Verificar si el archivo del modelo existe
     try:
-        # Cargamos los pesos (state_dict) en la CPU
-        state_dict = torch.load(model_path, map_location=torch.device('cpu'))
+        # Cargamos los pesos en una política de solo inferencia (sin optimizador ni memoria).
+        # La política pone el modelo en modo evaluación y siempre elige la mejor acción
+        # (100% explotación), así que la salida es determinista.
+        policy = GreedyPolicy.load(model_path)
         print(f"Modelo '{MODEL_FILE_NAME}' cargado exitosamente.")
     except FileNotFoundError:
         print(f"Error: No se encontró el archivo del modelo en '{model_path}'.")
         print("Por favor, ejecuta 'train.py' primero para entrenar y guardar un modelo.")
         return
 
-    # --- Inicialización del Agente ---
-    agent = Agent()
-    # 2. Cargar los pesos en la arquitectura del modelo del agente
-    agent.model.load_state_dict(state_dict)
-    # 3. Poner el modelo en modo de evaluación
-    # Esto es crucial: desactiva capas como Dropout o BatchNorm, asegurando
-    # que la salida sea determinista.
-    agent.model.eval()
-    
-    # 4. Forzar el modo de explotación (sin acciones aleatorias)
-    # Al poner epsilon en un valor negativo, la condición para exploración nunca se cumplirá.
-    agent.epsilon = -1 # Modo 100% explotación
-
     # --- Configuración del Juego a través del Menú ---
     pygame.init()
     pygame.font.init()
@@ -58,8 +49,12 @@ def play():
 
     # --- Bucle Principal del Juego ---
     pygame.display.set_caption('Snake Game - Agente DQL Jugando')
-    game = SnakeGameAI(width=SCREEN_WIDTH, height=SCREEN_HEIGHT, start_pos=start_pos, traps=list(traps))
+    game = SnakeGameAI(width=BOARD_WIDTH, height=BOARD_HEIGHT, start_pos=start_pos, traps=list(traps))
+    renderer = GameRenderer(screen)
     clock = pygame.time.Clock()
+    recorder = EpisodeRecorder(record) if record else None
+    if recorder is not None:
+        recorder.start(game)
     
     game_over = False
     while not game_over:
@@ -68,23 +63,28 @@ def play():
                 game_over = True
 
         # 1. Obtener el estado actual
-        state = agent.get_state(game)
+        state = policy.get_state(game)
         
-        # 2. Obtener la acción (será determinista gracias a epsilon = -1)
-        action = agent.get_action(state)
+        # 2. Obtener la acción (determinista: siempre la de mayor Q-valor)
+        action = policy.get_action(state)
         
         # 3. Realizar el movimiento y obtener el nuevo estado
         _, game_over, score = game.play_step(action)
+        if recorder is not None:
+            recorder.step(game, action)
         
         # 4. Dibujar el juego
-        game.draw(screen)
-        pygame.display.flip()
+        pygame.display.update(renderer.draw(game))
         
         # 5. Controlar la velocidad
         clock.tick(GAME_SPEED_PLAYBACK)
 
     # --- Fin de la Partida ---
     print(f"\nJuego terminado. El agente entrenado logró un puntaje de: {game.score}")
+    if recorder is not None:
+        recorder.end(game)
+        recorder.close()
+        print(f"Partida grabada en: {record}")
     
     # Mantener la ventana abierta por unos segundos para ver el resultado final
     pygame.time.wait(3000)
@@ -92,4 +92,7 @@ def play():
 
 # --- Punto de Entrada del Script ---
 if __name__ == '__main__':
-    play()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description='El agente entrenado juega en un tablero configurado por el usuario.')
+    parser.add_argument('--record', nargs='?', const=RECORD_FILE_PATH,
+                        help=f'Grabar la partida en este archivo (sin valor: {RECORD_FILE_PATH}).')
+    play(record=parser.parse_args().record)
\ No newline at end of file
@@ -0,0 +1,214 @@
+"""
+Banco de pruebas de rendimiento sin interfaz gráfica.
+Mide el rendimiento del entorno, de la codificación del estado, del paso de
+entrenamiento, del muestreo de la memoria y del entrenamiento de punta a punta,
+con semillas fijas, y escribe un informe JSON que se puede comparar con otro
+informe de referencia para detectar regresiones.
+
+Uso:
+    python benchmark.py --output bench.json
+    python benchmark.py --baseline bench_base.json --tolerance 0.1
+"""
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import numpy as np
+import torch
+
+from agent.dql_agent import Agent
+from snake_game.game import SnakeGameAI, Point
+from snake_game.vec_env import VecSnakeEnv
+from utils.seeding import seed_everything
+from config import BOARD_WIDTH, BOARD_HEIGHT, BATCH_SIZE, MAX_MEMORY
+
+# Métricas donde un valor mayor es mejor (el resto son latencias: menor es mejor)
+HIGHER_IS_BETTER = {'env_steps_per_sec', 'vec_env_steps_per_sec', 'states_per_sec', 'episodes_per_sec'}
+
+def _new_game():
+    # La semilla de cada partida sale del generador global, fijado con seed_everything
+    return SnakeGameAI(width=BOARD_WIDTH, height=BOARD_HEIGHT,
+                       start_pos=Point(BOARD_WIDTH // 2, BOARD_HEIGHT // 2), traps=[],
+                       seed=random.getrandbits(32))
+
+def _random_move():
+    move = [0, 0, 0]
+    move[random.randint(0, 2)] = 1
+    return move
+
+def bench_env(steps):
+    """Pasos por segundo de SnakeGameAI.play_step con acciones aleatorias."""
+    game = _new_game()
+    start = time.perf_counter()
+    for _ in range(steps):
+        _, done, _ = game.play_step(_random_move())
+        if done:
+            game = _new_game()
+    return steps / (time.perf_counter() - start)
+
+def bench_vec_env(steps, num_envs):
+    """Pasos de partida por segundo de VecSnakeEnv (cada llamada a step cuenta `num_envs`)."""
+    env = VecSnakeEnv(num_envs, width=BOARD_WIDTH, height=BOARD_HEIGHT,
+                      start_pos=Point(BOARD_WIDTH // 2, BOARD_HEIGHT // 2), traps=[], seed=0)
+    calls = max(1, steps // num_envs)
+    start = time.perf_counter()
+    for _ in range(calls):
+        env.step(np.random.randint(0, 3, size=num_envs))
+    return calls * num_envs / (time.perf_counter() - start)
+
+def bench_get_state(agent, steps):
+    """Estados por segundo de Agent.get_state sobre una partida en curso."""
+    game = _new_game()
+    elapsed = 0.0
+    for _ in range(steps):
+        start = time.perf_counter()
+        agent.get_state(game)
+        elapsed += time.perf_counter() - start
+        _, done, _ = game.play_step(_random_move())
+        if done:
+            game = _new_game()
+    return steps / elapsed
+
+def bench_train_step(agent, batch_size, repeats):
+    """Latencia media (ms) de Agent.train_step con un lote sintético de `batch_size`."""
+    state_size = agent.encoder.size
+    states = np.random.randint(0, 2, size=(batch_size, state_size))
+    next_states = np.random.randint(0, 2, size=(batch_size, state_size))
+    actions = np.random.randint(0, 3, size=batch_size)
+    rewards = np.random.choice([-10, 0, 10], size=batch_size)
+    dones = np.random.rand(batch_size) < 0.05
+    if batch_size == 1:
+        # Mismo formato que la memoria a corto plazo: una transición sin dimensión de lote
+        args = (states[0], actions[0], rewards[0], next_states[0], dones[0])
+    else:
+        args = (states, actions, rewards, next_states, dones)
+
+    agent.train_step(*args)  # Calentamiento
+    start = time.perf_counter()
+    for _ in range(repeats):
+        agent.train_step(*args)
+    return (time.perf_counter() - start) / repeats * 1000
+
+def bench_replay_sample(agent, repeats):
+    """Latencia media (ms) de muestrear BATCH_SIZE transiciones con la memoria llena."""
+    memory = agent.memory
+    state_size = memory.state_size
+    chunk = 10_000
+    for _ in range(0, MAX_MEMORY, chunk):
+        memory.push_batch(
+            np.random.randint(0, 2, size=(chunk, state_size)),
+            np.random.randint(0, 3, size=chunk),
+            np.random.choice([-10, 0, 10], size=chunk),
+            np.random.randint(0, 2, size=(chunk, state_size)),
+            np.random.rand(chunk) < 0.05,
+        )
+    start = time.perf_counter()
+    for _ in range(repeats):
+        memory.sample_weighted(BATCH_SIZE)
+    return (time.perf_counter() - start) / repeats * 1000
+
+def bench_episodes(episodes, max_steps, seed=None):
+    """
+    Partidas por segundo del bucle de entrenamiento de train.py (sin gráficos ni
+    guardado). Cada partida se corta a `max_steps` pasos para acotar la duración.
+    """
+    agent = Agent(seed=seed)
+    game = _new_game()
+    state_old = agent.get_state(game)
+    steps = 0
+    start = time.perf_counter()
+    while agent.n_games < episodes:
+        final_move = agent.get_action(state_old)
+        reward, done, _ = game.play_step(final_move)
+        state_new = agent.get_state(game)
+        steps += 1
+        done = done or steps >= max_steps
+        agent.train_short_memory(state_old, final_move, reward, state_new, done)
+        agent.remember(state_old, final_move, reward, state_new, done)
+        agent.scheduled_update()
+        if done:
+            game = _new_game()
+            state_new = agent.get_state(game)
+            agent.n_games += 1
+            agent.train_long_memory()
+            steps = 0
+        state_old = state_new
+    return episodes / (time.perf_counter() - start)
+
+def run(args):
+    seed_everything(args.seed)
+    agent = Agent(seed=args.seed)
+    results = {
+        'env_steps_per_sec': bench_env(args.steps),
+        'vec_env_steps_per_sec': bench_vec_env(args.steps, args.num_envs),
+        'states_per_sec': bench_get_state(agent, args.steps),
+        'train_step_ms_batch_1': bench_train_step(agent, 1, args.repeats),
+        f'train_step_ms_batch_{BATCH_SIZE}': bench_train_step(agent, BATCH_SIZE, args.repeats),
+        'replay_sample_ms': bench_replay_sample(agent, args.repeats),
+    }
+    seed_everything(args.seed)
+    results['episodes_per_sec'] = bench_episodes(args.episodes, args.max_steps, seed=args.seed)
+
+    return {
+        'meta': {
+            'seed': args.seed,
+            'steps': args.steps,
+            'repeats': args.repeats,
+            'episodes': args.episodes,
+            'python': platform.python_version(),
+            'torch': torch.__version__,
+            'numpy': np.__version__,
+            'machine': platform.machine(),
+        },
+        'results': results,
+    }
+
+def compare(report, baseline, tolerance):
+    """
+    Compara cada métrica con la referencia. Devuelve la lista de regresiones:
+    métricas que empeoran más que `tolerance` (fracción relativa).
+    """
+    regressions = []
+    for name, value in report['results'].items():
+        base = baseline['results'].get(name)
+        if not base:
+            continue
+        ratio = value / base
+        change = ratio - 1 if name in HIGHER_IS_BETTER else 1 - ratio
+        status = 'OK'
+        if change < -tolerance:
+            status = 'REGRESIÓN'
+            regressions.append(name)
+        print(f'{name:28s} {value:12.3f}  (referencia {base:12.3f}, {change:+.1%})  {status}')
+    return regressions
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Banco de pruebas de rendimiento del agente Snake.')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--steps', type=int, default=20_000, help='Pasos para las pruebas de entorno y estado.')
+    parser.add_argument('--num-envs', type=int, default=64, help='Partidas simultáneas para VecSnakeEnv.')
+    parser.add_argument('--repeats', type=int, default=50, help='Repeticiones para las latencias.')
+    parser.add_argument('--episodes', type=int, default=50, help='Partidas para la prueba de punta a punta.')
+    parser.add_argument('--max-steps', type=int, default=2000, help='Pasos máximos por partida de punta a punta.')
+    parser.add_argument('--output', help='Ruta del informe JSON (por defecto se imprime).')
+    parser.add_argument('--baseline', help='Informe JSON de referencia con el que comparar.')
+    parser.add_argument('--tolerance', type=float, default=0.10, help='Empeoramiento relativo admitido.')
+    args = parser.parse_args()
+
+    report = run(args)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Informe guardado en: {args.output}")
+    else:
+        print(json.dumps(report, indent=2))
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.tolerance)
+        if regressions:
+            print(f"Regresiones detectadas: {', '.join(regressions)}")
+            sys.exit(1)
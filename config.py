@@ -15,6 +15,12 @@ BLOCK_SIZE = 20
 SCREEN_WIDTH = 40 * BLOCK_SIZE  # 800 píxeles
 SCREEN_HEIGHT = 30 * BLOCK_SIZE # 600 píxeles
 
+# CONFIGURACIÓN DEL TABLERO
+# Tamaño del tablero en celdas. El motor del juego trabaja solo en celdas;
+# al dibujar, cada celda se escala para que el tablero quepa en la ventana.
+BOARD_WIDTH = 40
+BOARD_HEIGHT = 30
+
 # Velocidad del juego 
 GAME_SPEED_HUMAN = 15
 GAME_SPEED_AGENT = 100
@@ -47,15 +53,82 @@ BATCH_SIZE = 1000           # Tamaño del lote para el entrenamiento desde la me
 LR = 0.001                  # Tasa de aprendizaje para el optimizador Adam
 GAMMA = 0.9                 # Factor de descuento para recompensas futuras
 
+# --- Memoria de Repetición Prioritaria (PER) ---
+PRIORITIZED_REPLAY = False  # Muestrear según el error TD en vez de uniformemente
+PER_ALPHA = 0.6             # Cuánto influye la prioridad (0 = uniforme)
+PER_BETA_START = 0.4        # Corrección inicial por importancia; crece linealmente hasta 1
+PER_BETA_STEPS = 100_000    # Lotes muestreados hasta que beta llega a 1
+PER_EPS = 1e-5              # Evita prioridades nulas
+
+# --- Calendario de Actualizaciones del Modelo ---
+# Los valores por defecto reproducen el esquema clásico: un paso de optimización
+# por transición (memoria corta) y un lote de BATCH_SIZE al terminar cada partida.
+TRAIN_SHORT_MEMORY = True   # Entrenar con cada transición individual (lote de 1)
+TRAIN_EVERY_STEPS = 0       # Entrenar con un minilote de la memoria cada K pasos del entorno (0 = desactivado)
+GRADIENT_STEPS = 1          # Pasos de gradiente en cada actualización programada
+MINI_BATCH_SIZE = 64        # Tamaño del minilote de las actualizaciones programadas
+WARMUP_SIZE = 1000          # Transiciones mínimas en memoria antes de las actualizaciones programadas
+
+# --- Red Objetivo y Double DQN ---
+TARGET_UPDATE = None        # None (sin red objetivo), 'hard' (copia periódica) o 'soft' (promedio de Polyak)
+TARGET_UPDATE_INTERVAL = 1000  # Pasos de entrenamiento entre copias completas (modo 'hard')
+TAU = 0.005                 # Peso de la red en línea en cada actualización suave (modo 'soft')
+DOUBLE_DQN = False          # La red en línea elige la acción de s' y la red objetivo la evalúa (requiere TARGET_UPDATE)
+
+# --- Codificación de las Observaciones (ver agent/encoders.py) ---
+OBSERVATION_ENCODER = 'basic'  # 'basic' (11 binarias), 'rays' (8 rayos de distancias) o 'window' (ventana k x k)
+WINDOW_SIZE = 7             # Lado de la ventana del codificador 'window' (impar, centrada en la cabeza)
+
 # --- Modelo de Red Neuronal ---
-INPUT_SIZE = 11
+INPUT_SIZE = 11             # Tamaño de entrada del codificador 'basic' (los demás fijan el suyo)
 HIDDEN_SIZE = 256           # Número de neuronas en la capa oculta
 OUTPUT_SIZE = 3             # Número de acciones posibles: [Recto, Derecha, Izquierda]
 
+# --- Selección de Acciones durante el Entrenamiento ---
+ACTION_BACKEND = 'numpy'    # 'numpy' (réplica de la red en NumPy), 'torch' o 'table' (tabla de 2^11 estados, ver QTable)
+TABLE_COMPILE_AFTER = 128   # Con 'table': acciones con los mismos pesos antes de recompilar la tabla (antes, réplica en NumPy)
+
+# --- Inferencia (jugar con un modelo ya entrenado) ---
+INFERENCE_BACKEND = 'numpy'  # 'numpy', 'torch', 'script' (TorchScript) o 'table' (tabla de consulta precompilada)
+
 # --- Parámetros de Entrenamiento ---
 # El número de juegos 
 NUM_EPISODES = 1000
 
+# Semilla para reproducir exactamente un entrenamiento (None = cada ejecución es distinta).
+# Fija la red inicial, la exploración, el muestreo de la memoria y la comida de cada partida.
+SEED = None
+
+# --- Currículo (`train.py --curriculum`) ---
+# Etapas de menor a mayor dificultad: tamaño del tablero en celdas, fracción de
+# celdas con trampas y media de puntaje (en las últimas CURRICULUM_WINDOW partidas
+# de la etapa) necesaria para pasar a la siguiente. La última etapa no tiene umbral.
+CURRICULUM_STAGES = [
+    {'width': 10, 'height': 10, 'trap_density': 0.00, 'promote_at': 8},
+    {'width': 15, 'height': 15, 'trap_density': 0.02, 'promote_at': 12},
+    {'width': 20, 'height': 20, 'trap_density': 0.04, 'promote_at': 15},
+    {'width': 30, 'height': 25, 'trap_density': 0.05, 'promote_at': 20},
+    {'width': BOARD_WIDTH, 'height': BOARD_HEIGHT, 'trap_density': 0.06, 'promote_at': None},
+]
+CURRICULUM_WINDOW = 100
+
+# --- Entrenamiento Vectorizado (varias partidas en un solo proceso) ---
+NUM_ENVS = 64               # Partidas simultáneas por defecto con `train.py --envs`
+
+# --- Entrenamiento en Paralelo (actores + aprendiz central) ---
+NUM_WORKERS = 4             # Procesos actores por defecto con `train.py --workers`
+WEIGHT_SYNC_INTERVAL = 10   # Cada cuántas partidas se publican los pesos a los actores
+ACTOR_FLUSH_STEPS = 500     # Máximo de transiciones que un actor acumula antes de enviarlas
+ACTOR_QUEUE_SIZE = 64       # Bloques en cola hacia el aprendiz; con la cola llena los actores esperan
+ACTOR_POLL_SECONDS = 1.0    # Cada cuánto comprueba el aprendiz que los actores siguen vivos mientras espera
+
+# --- Evaluación sin Interfaz (evaluate.py) ---
+EVAL_EPISODES = 100         # Partidas por tablero
+EVAL_MAX_STEPS = 10_000     # Pasos máximos por partida (al llegar se cuenta como 'timeout')
+EVAL_LAYOUTS = 20           # Tableros generados al azar si no se pasa un archivo de tableros
+EVAL_TRAPS = 10             # Trampas de cada tablero generado
+EVAL_CHUNK = 25             # Partidas por tarea enviada a cada proceso
+
 # CONFIGURACIÓN DE ARCHIVOS Y CARPETAS
 # Carpeta donde se guardarán los modelos entrenados
 MODEL_FOLDER_PATH = './trained_models'
@@ -64,4 +137,27 @@ MODEL_FOLDER_PATH = './trained_models'
 MODEL_FILE_NAME = 'dql_snake_model.pth'
 
 # Carpeta para guardar gráficos de progreso
-PLOT_FOLDER_PATH = './plots'
\ No newline at end of file
+PLOT_FOLDER_PATH = './plots'
+
+# Gráfico de progreso
+PLOT_INTERVAL = 25          # Cada cuántas partidas se regenera el gráfico
+PLOT_MAX_POINTS = 2000      # Puntos máximos por línea (las partidas se agrupan al superar este número)
+PLOT_IN_BACKGROUND = True   # Generar el gráfico en un hilo aparte para no frenar el entrenamiento
+
+# Estadísticas de puntajes
+STATS_WINDOW = 100          # Partidas de la media móvil que se muestra en consola
+
+# Registro de métricas del entrenamiento (una línea JSON por intervalo)
+METRICS_ENABLED = True
+METRICS_FILE_PATH = './metrics/training_metrics.jsonl'
+METRICS_FLUSH_SECONDS = 10  # Cada cuántos segundos se escribe una línea
+
+# Grabación de partidas (`--record` en train.py, agent_play.py y main_human.py; se reproducen con replay.py)
+RECORD_FILE_PATH = './recordings/episodes.snkrec'
+RECORD_SNAPSHOT_INTERVAL = 256  # Cada cuántos pasos se guarda una foto completa del estado (para saltar rápido)
+
+# Carpeta del checkpoint completo para reanudar entrenamientos (`train.py --resume`)
+CHECKPOINT_FOLDER_PATH = './checkpoints'
+
+# Cada cuántas partidas se guarda el checkpoint completo
+CHECKPOINT_INTERVAL = 100
\ No newline at end of file
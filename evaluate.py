@@ -0,0 +1,162 @@
+"""
+Evaluación sin interfaz gráfica de un modelo entrenado.
+Juega muchas partidas greedy (sin exploración) sobre un conjunto de tableros,
+repartidas en un grupo de procesos, y resume la distribución de puntajes, las
+causas de muerte y el rendimiento en pasos por segundo. Con `--min-score`
+termina con código 1 si la media no llega al umbral (útil para decidir si se
+promociona un modelo).
+
+Uso:
+    python evaluate.py --generate 50 --board 20 20 --traps 15 --episodes 200
+    python evaluate.py --layouts tableros.json --output eval.json --min-score 10
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import torch
+import torch.multiprocessing as mp
+
+from agent.policy import GreedyPolicy
+from snake_game.game import SnakeGameAI
+from snake_game.layouts import generate_layout, load_layouts, save_layouts, game_kwargs
+from utils.seeding import derive_seed
+from config import (
+    MODEL_FOLDER_PATH, MODEL_FILE_NAME, INFERENCE_BACKEND, BOARD_WIDTH, BOARD_HEIGHT, NUM_WORKERS,
+    EVAL_EPISODES, EVAL_MAX_STEPS, EVAL_LAYOUTS, EVAL_TRAPS, EVAL_CHUNK
+)
+
+# Política de cada proceso del grupo (se carga una vez en `_init_worker`)
+_policy = None
+
+def _init_worker(model_path, backend):
+    global _policy
+    # Un hilo por proceso del Pool para que los procesos no compitan por los núcleos
+    torch.set_num_threads(1)
+    _policy = GreedyPolicy.load(model_path, backend=backend)
+
+def play_episode(policy, layout, seed=None, max_steps=EVAL_MAX_STEPS):
+    """
+    Juega una partida greedy en `layout`. Devuelve (puntaje, pasos, causa), con
+    causa 'wall', 'body' o 'trap' (choque), 'win' (tablero lleno) o 'timeout'.
+    """
+    game = SnakeGameAI(**game_kwargs(layout), seed=seed)
+    for steps in range(1, max_steps + 1):
+        _, done, score = game.play_step(policy.get_action(policy.get_state(game)))
+        if done:
+            return score, steps, game.collision_cause() or 'win'
+    return game.score, max_steps, 'timeout'
+
+def _play_chunk(layout_idx, layout, seeds, max_steps):
+    return [(layout_idx, *play_episode(_policy, layout, seed, max_steps)) for seed in seeds]
+
+def evaluate(model_path, layouts, episodes=EVAL_EPISODES, max_steps=EVAL_MAX_STEPS,
+             workers=NUM_WORKERS, seed=0, backend=INFERENCE_BACKEND):
+    """
+    Juega `episodes` partidas en cada tablero de `layouts` con `workers` procesos.
+    Cada partida tiene una semilla derivada de `seed`, del tablero y del número de
+    partida, así que el resultado no depende del reparto entre procesos.
+    Devuelve el informe como diccionario.
+    """
+    tasks = []
+    for layout_idx, layout in enumerate(layouts):
+        seeds = [derive_seed(seed, 'eval', layout_idx, episode) for episode in range(episodes)]
+        for start in range(0, episodes, EVAL_CHUNK):
+            tasks.append((layout_idx, layout, seeds[start:start + EVAL_CHUNK], max_steps))
+
+    start_time = time.perf_counter()
+    results = []
+    with ProcessPoolExecutor(max_workers=workers, mp_context=mp.get_context('spawn'),
+                             initializer=_init_worker, initargs=(model_path, backend)) as pool:
+        for chunk in pool.map(_play_chunk, *zip(*tasks)):
+            results.extend(chunk)
+    seconds = time.perf_counter() - start_time
+
+    layout_ids = np.array([r[0] for r in results])
+    scores = np.array([r[1] for r in results])
+    steps = np.array([r[2] for r in results])
+    causes = Counter(r[3] for r in results)
+
+    return {
+        'meta': {
+            'model': model_path,
+            'backend': backend,
+            'layouts': len(layouts),
+            'episodes_per_layout': episodes,
+            'max_steps': max_steps,
+            'workers': workers,
+            'seed': seed,
+        },
+        'results': {
+            'episodes': len(results),
+            'steps': int(steps.sum()),
+            'seconds': round(seconds, 3),
+            'steps_per_sec': round(steps.sum() / seconds, 1),
+            'episodes_per_sec': round(len(results) / seconds, 2),
+            'score': {
+                'mean': float(scores.mean()),
+                'std': float(scores.std()),
+                'min': int(scores.min()),
+                **{f'p{q}': float(np.percentile(scores, q)) for q in (25, 50, 75, 90, 99)},
+                'max': int(scores.max()),
+            },
+            'death_causes': {cause: causes[cause] for cause in ('wall', 'body', 'trap', 'timeout', 'win')},
+            'per_layout': [
+                {'layout': i, 'mean_score': float(scores[layout_ids == i].mean()),
+                 'max_score': int(scores[layout_ids == i].max())}
+                for i in range(len(layouts))
+            ],
+        },
+    }
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Evaluación sin interfaz de un modelo entrenado de Snake.')
+    parser.add_argument('--model', default=os.path.join(MODEL_FOLDER_PATH, MODEL_FILE_NAME),
+                        help='Archivo del modelo guardado con Linear_QNet.save.')
+    parser.add_argument('--layouts', help='Archivo JSON de tableros (ver snake_game/layouts.py).')
+    parser.add_argument('--generate', type=int, default=EVAL_LAYOUTS,
+                        help='Tableros aleatorios a generar si no se pasa --layouts.')
+    parser.add_argument('--board', type=int, nargs=2, default=(BOARD_WIDTH, BOARD_HEIGHT), metavar=('ANCHO', 'ALTO'),
+                        help='Tamaño en celdas de los tableros generados.')
+    parser.add_argument('--traps', type=int, default=EVAL_TRAPS, help='Trampas de cada tablero generado.')
+    parser.add_argument('--save-layouts', help='Guardar los tableros usados en este archivo JSON.')
+    parser.add_argument('--episodes', type=int, default=EVAL_EPISODES, help='Partidas por tablero.')
+    parser.add_argument('--max-steps', type=int, default=EVAL_MAX_STEPS, help='Pasos máximos por partida.')
+    parser.add_argument('--workers', type=int, default=NUM_WORKERS, help='Procesos en paralelo.')
+    parser.add_argument('--backend', default=INFERENCE_BACKEND, choices=GreedyPolicy.BACKENDS)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='Ruta del informe JSON (por defecto se imprime).')
+    parser.add_argument('--min-score', type=float, help='Puntaje medio mínimo; si no se alcanza, sale con código 1.')
+    args = parser.parse_args()
+
+    if not os.path.exists(args.model):
+        print(f"Error: No se encontró el archivo del modelo en '{args.model}'.")
+        sys.exit(1)
+
+    if args.layouts:
+        layouts = load_layouts(args.layouts)
+    else:
+        rng = random.Random(derive_seed(args.seed, 'layouts'))
+        layouts = [generate_layout(*args.board, args.traps, rng) for _ in range(args.generate)]
+    if args.save_layouts:
+        save_layouts(layouts, args.save_layouts)
+
+    report = evaluate(args.model, layouts, args.episodes, args.max_steps, args.workers, args.seed, args.backend)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Informe guardado en: {args.output}")
+    else:
+        print(json.dumps(report, indent=2))
+
+    results = report['results']
+    print(f"Puntaje medio: {results['score']['mean']:.2f} en {results['episodes']} partidas "
+          f"({results['steps_per_sec']:.0f} pasos/s). Muertes: {results['death_causes']}")
+    if args.min_score is not None and results['score']['mean'] < args.min_score:
+        print(f"El puntaje medio no alcanza el mínimo de {args.min_score}.")
+        sys.exit(1)
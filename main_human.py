@@ -1,7 +1,10 @@
+import argparse
 import pygame
 from snake_game.game import SnakeGameAI, Direction
 from snake_game.menu import run_setup_menu
-from config import SCREEN_WIDTH, SCREEN_HEIGHT, GAME_SPEED_HUMAN
+from snake_game.recording import EpisodeRecorder
+from snake_game.render import GameRenderer
+from config import SCREEN_WIDTH, SCREEN_HEIGHT, BOARD_WIDTH, BOARD_HEIGHT, GAME_SPEED_HUMAN, RECORD_FILE_PATH
 
 def get_action_from_key(game, key):
 
@@ -47,8 +50,8 @@ def get_action_from_key(game, key):
     
     return action
 
-def main():
-    
+def main(record=None):
+    """Partida de un jugador humano. Con `record` (ruta de archivo) se graba la partida."""
     pygame.init()
     pygame.font.init()
     
@@ -65,8 +68,12 @@ def main():
 
     # 2. Configurar el juego con los parámetros del menú
     pygame.display.set_caption('Snake Game - Jugador Humano')
-    game = SnakeGameAI(width=SCREEN_WIDTH, height=SCREEN_HEIGHT, start_pos=start_pos, traps=list(traps))
+    game = SnakeGameAI(width=BOARD_WIDTH, height=BOARD_HEIGHT, start_pos=start_pos, traps=list(traps))
+    renderer = GameRenderer(screen)
     clock = pygame.time.Clock()
+    recorder = EpisodeRecorder(record) if record else None
+    if recorder is not None:
+        recorder.start(game)
     
     running = True
     last_key = None
@@ -87,13 +94,16 @@ def main():
 
         # Avanzar un paso en el juego
         reward, game_over, score = game.play_step(action)
+        if recorder is not None:
+            recorder.step(game, action)
         
         # Dibujar el estado actual del juego
-        game.draw(screen)
-        pygame.display.flip()
+        pygame.display.update(renderer.draw(game))
         
         # Si el juego termina, mostrar mensaje y esperar para salir
         if game_over:
+            if recorder is not None:
+                recorder.end(game)
             font = pygame.font.Font(None, 50)
             text = font.render(f"Juego Terminado. Puntaje: {score}", True, (255, 255, 255))
             text_rect = text.get_rect(center=(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2))
@@ -105,7 +115,13 @@ def main():
         # Controlar la velocidad del juego
         clock.tick(GAME_SPEED_HUMAN)
 
+    if recorder is not None:
+        recorder.close()  # Si se cerró la ventana antes de terminar, la partida queda como interrumpida
+        print(f"Partida grabada en: {record}")
     pygame.quit()
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description='Snake para un jugador humano.')
+    parser.add_argument('--record', nargs='?', const=RECORD_FILE_PATH,
+                        help=f'Grabar la partida en este archivo (sin valor: {RECORD_FILE_PATH}).')
+    main(record=parser.parse_args().record)
\ No newline at end of file
@@ -0,0 +1,107 @@
+"""
+Visor de partidas grabadas con `--record` (ver snake_game/recording.py).
+
+Controles: espacio pausa, flechas izquierda/derecha un paso atrás/adelante,
+Re Pág/Av Pág 100 pasos, Inicio/Fin principio/final de la partida y
+flechas arriba/abajo duplican/reducen los pasos por fotograma (avance rápido).
+
+Uso:
+    python replay.py --list
+    python replay.py recordings/episodes.snkrec --episode -1 --step 500
+"""
+import argparse
+import collections
+import itertools
+import sys
+import pygame
+
+from snake_game.recording import read_episodes, EpisodeReplayer
+from snake_game.render import GameRenderer
+from config import SCREEN_WIDTH, SCREEN_HEIGHT, RECORD_FILE_PATH
+
+def load_episode(path, index):
+    """Partida número `index` del archivo (negativo: contando desde el final)."""
+    if index < 0:
+        episodes = collections.deque(read_episodes(path), maxlen=-index)
+        episode = episodes[0] if len(episodes) == -index else None
+    else:
+        episode = next(itertools.islice(read_episodes(path), index, None), None)
+    if episode is None:
+        raise IndexError(f"El archivo '{path}' no tiene la partida {index}")
+    return episode
+
+def list_episodes(path):
+    for i, episode in enumerate(read_episodes(path)):
+        layout = episode.layout
+        end = (episode.cause or 'interrumpida') if episode.complete else 'incompleta'
+        print(f"{i}: {layout.width}x{layout.height}, trampas {len(layout.traps)}, semilla {episode.seed}, "
+              f"pasos {episode.steps}, puntaje {episode.score}, fin {end}")
+
+def view(episode, start_step=0, fps=20):
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    renderer = GameRenderer(screen)
+    clock = pygame.time.Clock()
+
+    replayer = EpisodeReplayer(episode)
+    replayer.seek(start_step)
+    paused = False
+    steps_per_frame = 1
+    pygame.display.update(renderer.draw(replayer.game))
+
+    jumps = {pygame.K_LEFT: -1, pygame.K_RIGHT: 1, pygame.K_PAGEUP: -100, pygame.K_PAGEDOWN: 100}
+    running = True
+    while running:
+        target = replayer.step
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_SPACE:
+                    paused = not paused
+                elif event.key in jumps:
+                    target += jumps[event.key]
+                    paused = True
+                elif event.key == pygame.K_HOME:
+                    target = 0
+                elif event.key == pygame.K_END:
+                    target = episode.steps
+                elif event.key == pygame.K_UP:
+                    steps_per_frame *= 2
+                elif event.key == pygame.K_DOWN:
+                    steps_per_frame = max(1, steps_per_frame // 2)
+
+        if target != replayer.step:
+            replayer.seek(target)
+        elif not paused:
+            # Avance rápido: se juegan varios pasos y solo se dibuja el último
+            for _ in range(steps_per_frame):
+                if not replayer.advance():
+                    paused = True
+                    break
+
+        pygame.display.set_caption(f"Repetición - paso {replayer.step}/{episode.steps} "
+                                   f"(x{steps_per_frame}{', pausa' if paused else ''})")
+        pygame.display.update(renderer.draw(replayer.game))
+        clock.tick(fps)
+
+    pygame.quit()
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Visor de partidas grabadas de Snake.')
+    parser.add_argument('path', nargs='?', default=RECORD_FILE_PATH, help='Archivo de grabación.')
+    parser.add_argument('--list', action='store_true', help='Listar las partidas del archivo y salir.')
+    parser.add_argument('--episode', type=int, default=-1, help='Partida a ver (negativo: desde el final).')
+    parser.add_argument('--step', type=int, default=0, help='Paso desde el que empezar.')
+    parser.add_argument('--fps', type=int, default=20, help='Fotogramas por segundo del visor.')
+    args = parser.parse_args()
+
+    if args.list:
+        list_episodes(args.path)
+        sys.exit(0)
+    try:
+        episode = load_episode(args.path, args.episode)
+    except IndexError as e:
+        print(f"Error: {e}.")
+        sys.exit(1)
+    view(episode, args.step, args.fps)
@@ -1,7 +1,7 @@
-import pygame
 import random
+from collections import deque
 from enum import Enum
-from config import Point, BLOCK_SIZE, COLOR_SNAKE_HEAD, COLOR_SNAKE_BODY, COLOR_FOOD, COLOR_TRAP, COLOR_BACKGROUND, COLOR_TEXT
+from config import Point
 
 # Usamos Enum para una gestión de direcciones más limpia y segura
 class Direction(Enum):
@@ -11,42 +11,134 @@ class Direction(Enum):
     DOWN = 4
 
 class SnakeGameAI:
-    def __init__(self, width, height, start_pos, traps):
+    """
+    Motor del juego en coordenadas de celda: `width` x `height` celdas, y la
+    posición inicial y las trampas son puntos enteros (columna, fila).
+    El dibujado está en snake_game/render.py.
+    """
+    def __init__(self, width, height, start_pos, traps, seed=None):
         self.width = width
         self.height = height
         self.start_pos = start_pos
         self.traps = traps
+        self.trap_set = set(traps)  # Búsqueda O(1) de trampas
+        # Generador propio de la partida: con la misma semilla la comida aparece en las mismas celdas
+        self.seed = seed
+        self.rng = random.Random(seed)
 
         # Estado inicial del juego
         self.direction = Direction.RIGHT  # Dirección de inicio por defecto
         self.head = self.start_pos
-        self.snake = [self.head, 
-                      Point(self.head.x - BLOCK_SIZE, self.head.y),
-                      Point(self.head.x - (2 * BLOCK_SIZE), self.head.y)]
-        
+        # La serpiente es una deque (cabeza en el índice 0) para insertar y quitar en O(1)
+        self.snake = deque([self.head,
+                            Point(self.head.x - 1, self.head.y),
+                            Point(self.head.x - 2, self.head.y)])
+        # Conjunto con los segmentos del cuerpo (todo menos la cabeza), actualizado incrementalmente
+        self.body_set = set(list(self.snake)[1:])
+
+        # Índice de celdas libres: lista + posición de cada celda en la lista.
+        # Permite sacar y devolver celdas en O(1) (intercambio con la última)
+        # y elegir una celda libre al azar sin reintentos.
+        self._free_cells = []
+        self._free_index = {}
+        self._listeners = []  # Objetos avisados al ocupar/liberar celdas (ver `add_listener`)
+        for y in range(self.height):
+            for x in range(self.width):
+                cell = Point(x, y)
+                if cell not in self.trap_set:
+                    self._free_index[cell] = len(self._free_cells)
+                    self._free_cells.append(cell)
+        for pt in self.snake:
+            self._occupy(pt)
+
         self.score = 0
+        self.frame_iteration = 0  # Pasos jugados (el renderizador lo usa para detectar saltos)
         self.food = None
         self._place_food()
 
+    def add_listener(self, listener):
+        """
+        Registra un objeto con métodos `on_occupy(pt)` y `on_release(pt)` que se
+        llaman cada vez que una celda del tablero pasa a estar ocupada o libre.
+        Permite mantener estructuras derivadas del tablero sin recorrerlo en cada paso.
+        """
+        self._listeners.append(listener)
+
+    def snapshot(self):
+        """Estado dinámico de la partida (serpiente, dirección, puntaje, comida y paso) para `restore`."""
+        return {
+            'snake': list(self.snake),
+            'direction': self.direction,
+            'score': self.score,
+            'food': self.food,
+            'frame_iteration': self.frame_iteration,
+        }
+
+    def restore(self, snapshot):
+        """
+        Vuelve al estado guardado con `snapshot` (del mismo tablero). Las celdas
+        se liberan y ocupan con `_release`/`_occupy`, así que los oyentes
+        registrados siguen al día. El generador de la comida no se restaura.
+        """
+        for pt in self.snake:
+            self._release(pt)
+        self.snake = deque(Point(*pt) for pt in snapshot['snake'])
+        self.head = self.snake[0]
+        self.body_set = set(list(self.snake)[1:])
+        for pt in self.snake:
+            self._occupy(pt)
+        self.direction = snapshot['direction']
+        self.score = snapshot['score']
+        self.food = Point(*snapshot['food']) if snapshot['food'] is not None else None
+        self.frame_iteration = snapshot['frame_iteration']
+
+    def _occupy(self, pt):
+        """Saca una celda del índice de celdas libres (si estaba en él)."""
+        idx = self._free_index.pop(pt, None)
+        if idx is None:
+            return
+        last = self._free_cells.pop()
+        if idx < len(self._free_cells):
+            # Mover la última celda al hueco que deja la celda ocupada
+            self._free_cells[idx] = last
+            self._free_index[last] = idx
+        for listener in self._listeners:
+            listener.on_occupy(pt)
+
+    def _release(self, pt):
+        """Devuelve una celda del tablero al índice de celdas libres."""
+        if pt in self._free_index or pt in self.trap_set or self._is_out_of_bounds(pt):
+            return
+        self._free_index[pt] = len(self._free_cells)
+        self._free_cells.append(pt)
+        for listener in self._listeners:
+            listener.on_release(pt)
+
     def _place_food(self):
-        
-        while True:
-            x = random.randint(0, (self.width - BLOCK_SIZE) // BLOCK_SIZE) * BLOCK_SIZE
-            y = random.randint(0, (self.height - BLOCK_SIZE) // BLOCK_SIZE) * BLOCK_SIZE
-            self.food = Point(x, y)
-            
-            # La comida no puede estar en la serpiente ni en una trampa
-            if self.food not in self.snake and self.food not in self.traps:
-                break
+        """
+        Coloca la comida en una celda libre elegida uniformemente en O(1).
+        Si no queda ninguna celda libre (la serpiente llena el tablero),
+        deja `self.food = None` y devuelve False.
+        """
+        # La comida no puede estar en la serpiente ni en una trampa: el índice solo contiene celdas libres
+        if not self._free_cells:
+            self.food = None
+            return False
+
+        self.food = self._free_cells[self.rng.randrange(len(self._free_cells))]
+        return True
 
     def play_step(self, action):
+        self.frame_iteration += 1
         
         # 1. Determinar la nueva dirección basada en la acción
         self._determine_direction(action)
 
         # 2. Mover la serpiente en la nueva dirección
+        # La cabeza anterior pasa a formar parte del cuerpo
+        self.body_set.add(self.head)
         self._move(self.direction)
-        self.snake.insert(0, self.head)
+        self.snake.appendleft(self.head)
 
         # 3. Comprobar si el juego ha terminado (colisión)
         reward = 0
@@ -56,13 +148,19 @@ class SnakeGameAI:
             reward = -10  # Penalización por morir
             return reward, game_over, self.score
 
+        self._occupy(self.head)
+
         # 4. Comprobar si ha comido
         if self.head == self.food:
             self.score += 1
             reward = 10  # Recompensa por comer
-            self._place_food()
+            if not self._place_food():
+                # Tablero lleno: no hay dónde poner más comida, la partida termina (victoria)
+                game_over = True
         else:
-            self.snake.pop()  # Si no come, se quita el último segmento
+            tail = self.snake.pop()  # Si no come, se quita el último segmento
+            self.body_set.discard(tail)
+            self._release(tail)
 
         return reward, game_over, self.score
 
@@ -86,50 +184,42 @@ class SnakeGameAI:
             pt = self.head
         
         # Colisión con las paredes
-        if pt.x > self.width - BLOCK_SIZE or pt.x < 0 or pt.y > self.height - BLOCK_SIZE or pt.y < 0:
+        if self._is_out_of_bounds(pt):
             return True
         # Colisión con su propio cuerpo
-        if pt in self.snake[1:]:
+        if pt in self.body_set:
             return True
         # Colisión con una trampa
-        if pt in self.traps:
+        if pt in self.trap_set:
             return True
         
         return False
 
+    def collision_cause(self, pt=None):
+        """Motivo de la colisión en `pt` (por defecto la cabeza): 'wall', 'body', 'trap' o None."""
+        if pt is None:
+            pt = self.head
+        if self._is_out_of_bounds(pt):
+            return 'wall'
+        if pt in self.body_set:
+            return 'body'
+        if pt in self.trap_set:
+            return 'trap'
+        return None
+
+    def _is_out_of_bounds(self, pt):
+        return pt.x >= self.width or pt.x < 0 or pt.y >= self.height or pt.y < 0
+
     def _move(self, direction):
         
         x, y = self.head.x, self.head.y
         if direction == Direction.RIGHT:
-            x += BLOCK_SIZE
+            x += 1
         elif direction == Direction.LEFT:
-            x -= BLOCK_SIZE
+            x -= 1
         elif direction == Direction.DOWN:
-            y += BLOCK_SIZE
+            y += 1
         elif direction == Direction.UP:
-            y -= BLOCK_SIZE
+            y -= 1
         
         self.head = Point(x, y)
-
-    def draw(self, screen):
-        
-        screen.fill(COLOR_BACKGROUND)
-        
-        # Dibujar serpiente
-        for i, pt in enumerate(self.snake):
-            if i == 0: # Cabeza
-                pygame.draw.rect(screen, COLOR_SNAKE_HEAD, (pt.x, pt.y, BLOCK_SIZE, BLOCK_SIZE))
-            else: # Cuerpo
-                pygame.draw.rect(screen, COLOR_SNAKE_BODY, (pt.x, pt.y, BLOCK_SIZE, BLOCK_SIZE))
-
-        # Dibujar comida
-        pygame.draw.rect(screen, COLOR_FOOD, (self.food.x, self.food.y, BLOCK_SIZE, BLOCK_SIZE))
-
-        # Dibujar trampas
-        for trap in self.traps:
-            pygame.draw.rect(screen, COLOR_TRAP, (trap.x, trap.y, BLOCK_SIZE, BLOCK_SIZE))
-        
-        # Dibujar puntaje
-        font = pygame.font.Font(None, 36)
-        text = font.render(f"Puntaje: {self.score}", True, COLOR_TEXT)
-        screen.blit(text, [10, 10])
\ No newline at end of file
@@ -0,0 +1,52 @@
+"""
+Tableros de juego: tamaño, posición inicial y trampas, en coordenadas de celda.
+Se pueden generar al azar (con semilla) o cargar/guardar en un archivo JSON
+con el formato:
+
+    [{"width": 40, "height": 30, "start": [20, 15], "traps": [[3, 4], [10, 7]]}, ...]
+"""
+import collections
+import json
+import random
+from config import Point
+
+Layout = collections.namedtuple('Layout', 'width, height, start_pos, traps')
+
+def game_kwargs(layout):
+    """Argumentos para crear un SnakeGameAI (o un VecSnakeEnv) con este tablero."""
+    return dict(width=layout.width, height=layout.height, start_pos=layout.start_pos, traps=list(layout.traps))
+
+def generate_layout(width, height, n_traps, rng=None):
+    """
+    Tablero aleatorio de `width` x `height` celdas con `n_traps` trampas.
+    La serpiente inicial (3 celdas mirando a la derecha) cabe siempre en el
+    tablero, y ni ella ni la celda de delante de la cabeza tienen trampas.
+    `rng` es un random.Random (para reproducir el tablero) o None.
+    """
+    if width < 4 or height < 1:
+        raise ValueError(f"El tablero debe tener al menos 4x1 celdas, no {width}x{height}")
+    rng = rng or random.Random()
+    start = Point(rng.randrange(2, width - 1), rng.randrange(height))
+    reserved = {Point(start.x + dx, start.y) for dx in (-2, -1, 0, 1)}
+    candidates = [Point(x, y) for y in range(height) for x in range(width) if Point(x, y) not in reserved]
+    traps = rng.sample(candidates, min(n_traps, len(candidates)))
+    return Layout(width, height, start, traps)
+
+def load_layouts(path):
+    """Lee una lista de tableros de un archivo JSON."""
+    with open(path) as f:
+        data = json.load(f)
+    return [
+        Layout(item['width'], item['height'], Point(*item['start']), [Point(*trap) for trap in item['traps']])
+        for item in data
+    ]
+
+def save_layouts(layouts, path):
+    """Guarda una lista de tableros en un archivo JSON (ver `load_layouts`)."""
+    data = [
+        {'width': layout.width, 'height': layout.height,
+         'start': list(layout.start_pos), 'traps': [list(trap) for trap in layout.traps]}
+        for layout in layouts
+    ]
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=2)
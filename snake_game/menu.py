@@ -1,15 +1,27 @@
 import pygame
 from config import (
-    SCREEN_WIDTH, SCREEN_HEIGHT, BLOCK_SIZE, Point,
-    COLOR_BACKGROUND, COLOR_GRID, COLOR_SNAKE_HEAD, COLOR_TRAP, COLOR_TEXT
+    BOARD_WIDTH, BOARD_HEIGHT,
+    COLOR_BACKGROUND, COLOR_SNAKE_HEAD, COLOR_TRAP, COLOR_TEXT
 )
+from .render import cell_size, cell_rect, pixel_to_cell, draw_grid, get_font
 
-def run_setup_menu(screen):
-
+def run_setup_menu(screen, cols=BOARD_WIDTH, rows=BOARD_HEIGHT):
+    """
+    Permite elegir con el ratón la posición inicial y las trampas de un tablero
+    de `cols` x `rows` celdas. Devuelve (inicio, trampas) en coordenadas de celda,
+    o (None, None) si se cierra la ventana.
+    """
+    size = cell_size(screen, cols, rows)
     start_pos = None
     traps = set()  # Usamos un set para evitar duplicados y facilitar la eliminación
 
-    font = pygame.font.Font(None, 36)
+    font = get_font(36)
+
+    # Fondo con la cuadrícula pre-renderizado una sola vez: cada fotograma solo lo copia
+    grid_surface = pygame.Surface(screen.get_size()).convert()
+    grid_surface.fill(COLOR_BACKGROUND)
+    draw_grid(grid_surface, cols, rows, size)
+
     clock = pygame.time.Clock()
     running = True
 
@@ -28,9 +40,9 @@ def run_setup_menu(screen):
 
             # Manejo del ratón
             if event.type == pygame.MOUSEBUTTONDOWN:
-                mx, my = pygame.mouse.get_pos()
-                grid_x, grid_y = mx // BLOCK_SIZE, my // BLOCK_SIZE
-                clicked_point = Point(grid_x * BLOCK_SIZE, grid_y * BLOCK_SIZE)
+                clicked_point = pixel_to_cell(pygame.mouse.get_pos(), size)
+                if clicked_point.x >= cols or clicked_point.y >= rows:
+                    continue # Clic fuera del tablero
 
                 if start_pos is None:
                     start_pos = clicked_point
@@ -44,21 +56,16 @@ def run_setup_menu(screen):
                         traps.add(clicked_point) # Añadir trampa
 
         # --- Lógica de dibujado ---
-        screen.fill(COLOR_BACKGROUND)
-
-        # Dibujar la cuadrícula
-        for x in range(0, SCREEN_WIDTH, BLOCK_SIZE):
-            pygame.draw.line(screen, COLOR_GRID, (x, 0), (x, SCREEN_HEIGHT))
-        for y in range(0, SCREEN_HEIGHT, BLOCK_SIZE):
-            pygame.draw.line(screen, COLOR_GRID, (0, y), (SCREEN_WIDTH, y))
+        # Fondo y cuadrícula
+        screen.blit(grid_surface, (0, 0))
             
         # Dibujar la posición de inicio
         if start_pos:
-            pygame.draw.rect(screen, COLOR_SNAKE_HEAD, (start_pos.x, start_pos.y, BLOCK_SIZE, BLOCK_SIZE))
+            pygame.draw.rect(screen, COLOR_SNAKE_HEAD, cell_rect(start_pos, size))
 
         # Dibujar las trampas
         for trap in traps:
-            pygame.draw.rect(screen, COLOR_TRAP, (trap.x, trap.y, BLOCK_SIZE, BLOCK_SIZE))
+            pygame.draw.rect(screen, COLOR_TRAP, cell_rect(trap, size))
 
         # Dibujar texto de instrucciones
         if not start_pos:
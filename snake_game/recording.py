@@ -0,0 +1,257 @@
+"""
+Grabación compacta de partidas y reproducción con saltos.
+
+Un archivo de grabación es una secuencia de registros binarios que solo se
+añaden al final, así que muchas partidas (de una o varias ejecuciones) caben
+en el mismo archivo y una ejecución interrumpida solo pierde la última.
+Cada registro empieza con un byte que indica su tipo:
+
+- 'H' inicio de partida: tablero, semilla, comida inicial e intervalo de fotos (JSON).
+- 'A' bloque de acciones: 2 bits por paso (0 recto, 1 derecha, 2 izquierda).
+- 'F' comida nueva: paso y celda (la comida se guarda porque las partidas
+  humanas no tienen semilla y porque así la reproducción no depende del
+  generador aleatorio).
+- 'S' foto del estado: paso, puntaje, dirección, comida y celdas de la serpiente.
+- 'E' fin de partida: pasos, puntaje y causa.
+
+La reproducción rehace la partida con el motor del juego: para ir a un paso
+cualquiera se restaura la foto anterior más cercana y se juegan las acciones
+que faltan (como mucho RECORD_SNAPSHOT_INTERVAL pasos).
+"""
+import bisect
+import json
+import os
+import struct
+from snake_game.game import SnakeGameAI, Direction
+from snake_game.layouts import Layout, game_kwargs
+from config import Point, RECORD_FILE_PATH, RECORD_SNAPSHOT_INTERVAL
+
+MAGIC = b'SNKREC1\n'
+
+# Orden de las direcciones en las fotos (el mismo sentido horario que usa el juego)
+_DIRECTIONS = [Direction.RIGHT, Direction.DOWN, Direction.LEFT, Direction.UP]
+# Causas de fin de partida (ver evaluate.py); None se guarda como 0
+CAUSES = (None, 'wall', 'body', 'trap', 'win', 'timeout')
+# Acciones one-hot en el orden de los códigos de 2 bits
+ACTIONS = ([1, 0, 0], [0, 1, 0], [0, 0, 1])
+
+_MAX_BLOCK = 0xFFFC  # Acciones máximas por registro 'A' (cabe en 16 bits y es múltiplo de 4)
+
+def action_code(action):
+    """Código de 2 bits de una acción one-hot (o de un código ya convertido)."""
+    if isinstance(action, int):
+        return action
+    if action[1] == 1:
+        return 1
+    if action[2] == 1:
+        return 2
+    return 0
+
+def pack_actions(codes):
+    """Empaqueta códigos de acción de 2 bits, 4 por byte."""
+    packed = bytearray((len(codes) + 3) // 4)
+    for i, code in enumerate(codes):
+        packed[i >> 2] |= code << ((i & 3) * 2)
+    return packed
+
+def unpack_actions(data, n):
+    """Inversa de `pack_actions`: los `n` primeros códigos de `data`."""
+    return bytearray((data[i >> 2] >> ((i & 3) * 2)) & 3 for i in range(n))
+
+class EpisodeRecorder:
+    """
+    Escribe partidas en el archivo `path` (se abre para añadir). Uso:
+    `start(game)` al crear la partida, `step(game, action)` después de cada
+    `play_step` y `end(game)` al terminar. Las acciones se acumulan en memoria
+    y se escriben en bloques junto con cada foto o comida nueva.
+    """
+    def __init__(self, path=RECORD_FILE_PATH, snapshot_interval=RECORD_SNAPSHOT_INTERVAL):
+        folder = os.path.dirname(path)
+        if folder and not os.path.exists(folder):
+            os.makedirs(folder)
+        self.path = path
+        self.snapshot_interval = snapshot_interval
+        self.file = open(path, 'ab')
+        if self.file.tell() == 0:
+            self.file.write(MAGIC)
+        self.game = None
+
+    def start(self, game):
+        """Empieza a grabar `game` (recién creada). Si había otra partida sin terminar, la cierra sin causa."""
+        if self.game is not None:
+            self._write_end(None)
+        header = {
+            'width': game.width, 'height': game.height, 'start': list(game.start_pos),
+            'traps': [list(trap) for trap in game.traps], 'seed': game.seed,
+            'food': list(game.food) if game.food is not None else None,
+            'snapshot_interval': self.snapshot_interval,
+        }
+        data = json.dumps(header, separators=(',', ':')).encode()
+        self.file.write(b'H' + struct.pack('<I', len(data)) + data)
+        self.game = game
+        self.steps = 0
+        self._pending = []
+        self._food = game.food
+
+    def step(self, game, action):
+        """Registra la acción `action` que se acaba de jugar en `game`."""
+        self._pending.append(action_code(action))
+        self.steps += 1
+        if len(self._pending) >= _MAX_BLOCK:
+            self._flush_actions()
+        if game.food != self._food:
+            self._flush_actions()
+            self.file.write(b'F' + struct.pack('<Ii', self.steps, self._cell(game, game.food)))
+            self._food = game.food
+        if self.steps % self.snapshot_interval == 0 and game.collision_cause() is None:
+            self._flush_actions()
+            self._write_snapshot(game)
+
+    def end(self, game, cause=None):
+        """
+        Cierra la partida. `cause` es una de CAUSES; por defecto la causa del
+        choque, o 'win' si no hubo choque.
+        """
+        self._write_end(cause or game.collision_cause() or 'win')
+
+    def close(self):
+        """Cierra el archivo; una partida a medias queda grabada sin causa de fin."""
+        if self.game is not None:
+            self._write_end(None)
+        self.file.close()
+
+    def _write_end(self, cause):
+        self._flush_actions()
+        self.file.write(b'E' + struct.pack('<IIB', self.steps, self.game.score, CAUSES.index(cause)))
+        self.file.flush()
+        self.game = None
+
+    def _flush_actions(self):
+        if self._pending:
+            self.file.write(b'A' + struct.pack('<H', len(self._pending)) + pack_actions(self._pending))
+            self._pending = []
+
+    @staticmethod
+    def _cell(game, pt):
+        return -1 if pt is None else pt.y * game.width + pt.x
+
+    def _write_snapshot(self, game):
+        cells = [pt.y * game.width + pt.x for pt in game.snake]
+        self.file.write(b'S' + struct.pack(f'<IIBiI{len(cells)}I', self.steps, game.score,
+                                           _DIRECTIONS.index(game.direction), self._cell(game, game.food),
+                                           len(cells), *cells))
+
+class Episode:
+    """
+    Una partida leída de un archivo de grabación: tablero (`layout`), semilla,
+    acciones (códigos de 2 bits), comidas por paso, fotos y resultado.
+    Si el archivo se cortó antes del registro de fin, `complete` es False; si
+    la partida se dejó a medias (ver `EpisodeRecorder.close`), `cause` es None.
+    """
+    def __init__(self, header):
+        self.header = header
+        self.layout = Layout(header['width'], header['height'], Point(*header['start']),
+                             [Point(*trap) for trap in header['traps']])
+        self.seed = header['seed']
+        self.actions = bytearray()
+        self.foods = {0: self._point(header['food'])}
+        self.snapshots = []  # Lista de (paso, foto) ordenada por paso
+        self.complete = False
+        self.score = 0
+        self.cause = None
+
+    @property
+    def steps(self):
+        return len(self.actions)
+
+    @staticmethod
+    def _point(cell):
+        return Point(*cell) if cell is not None else None
+
+    def _cell_point(self, cell):
+        return None if cell < 0 else Point(cell % self.layout.width, cell // self.layout.width)
+
+def read_episodes(path):
+    """Genera las partidas del archivo de grabación `path`, en orden."""
+    with open(path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"'{path}' no es un archivo de grabación de partidas")
+        episode = None
+        try:
+            while True:
+                tag = f.read(1)
+                if not tag:
+                    break
+                if tag == b'H':
+                    if episode is not None:
+                        yield episode
+                    (size,) = struct.unpack('<I', _read(f, 4))
+                    episode = Episode(json.loads(_read(f, size)))
+                elif tag == b'A':
+                    (n,) = struct.unpack('<H', _read(f, 2))
+                    episode.actions += unpack_actions(_read(f, (n + 3) // 4), n)
+                elif tag == b'F':
+                    step, cell = struct.unpack('<Ii', _read(f, 8))
+                    episode.foods[step] = episode._cell_point(cell)
+                elif tag == b'S':
+                    step, score, direction, food, n = struct.unpack('<IIBiI', _read(f, 17))
+                    cells = struct.unpack(f'<{n}I', _read(f, 4 * n))
+                    episode.snapshots.append((step, {
+                        'snake': [episode._cell_point(cell) for cell in cells],
+                        'direction': _DIRECTIONS[direction],
+                        'score': score,
+                        'food': episode._cell_point(food),
+                        'frame_iteration': step,
+                    }))
+                elif tag == b'E':
+                    _, episode.score, cause = struct.unpack('<IIB', _read(f, 9))
+                    episode.cause = CAUSES[cause]
+                    episode.complete = True
+                else:
+                    raise ValueError(f"Registro desconocido {tag!r} en '{path}'")
+        except EOFError:
+            pass  # Archivo cortado a mitad de un registro (ejecución interrumpida)
+        if episode is not None:
+            yield episode
+
+def _read(f, n):
+    data = f.read(n)
+    if len(data) < n:
+        raise EOFError
+    return data
+
+class EpisodeReplayer:
+    """
+    Reconstruye una partida grabada paso a paso en un SnakeGameAI (`self.game`,
+    que se puede dibujar con GameRenderer). `seek(step)` salta a cualquier paso
+    restaurando la foto anterior más cercana y jugando las acciones restantes.
+    """
+    def __init__(self, episode):
+        self.episode = episode
+        self.game = SnakeGameAI(**game_kwargs(episode.layout), seed=episode.seed)
+        self.game.food = episode.foods[0]
+        self.step = 0
+        self._snapshot_steps = [0] + [step for step, _ in episode.snapshots]
+        self._snapshots = [self.game.snapshot()] + [snapshot for _, snapshot in episode.snapshots]
+
+    def advance(self):
+        """Juega el siguiente paso grabado. Devuelve False si ya no quedan pasos."""
+        if self.step >= self.episode.steps:
+            return False
+        self.game.play_step(ACTIONS[self.episode.actions[self.step]])
+        self.step += 1
+        if self.step in self.episode.foods:
+            # La comida grabada manda sobre la que eligió el generador del juego
+            self.game.food = self.episode.foods[self.step]
+        return True
+
+    def seek(self, step):
+        """Deja `self.game` en el estado tras `step` pasos (se limita a la duración de la partida)."""
+        step = max(0, min(step, self.episode.steps))
+        i = bisect.bisect_right(self._snapshot_steps, step) - 1
+        if step < self.step or self._snapshot_steps[i] > self.step:
+            self.game.restore(self._snapshots[i])
+            self.step = self._snapshot_steps[i]
+        while self.step < step:
+            self.advance()
+        return self.game
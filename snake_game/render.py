@@ -0,0 +1,127 @@
+"""
+Capa de dibujado: traduce las coordenadas de celda del motor del juego a
+píxeles de la pantalla. El motor (SnakeGameAI, VecSnakeEnv) no conoce ni
+pygame ni el tamaño de la ventana, así que las ejecuciones sin interfaz no
+hacen ninguna cuenta en píxeles.
+"""
+import pygame
+from config import (
+    Point, COLOR_SNAKE_HEAD, COLOR_SNAKE_BODY, COLOR_FOOD, COLOR_TRAP,
+    COLOR_BACKGROUND, COLOR_TEXT, COLOR_GRID
+)
+
+def cell_size(screen, cols, rows):
+    """Lado en píxeles de una celda para que un tablero de `cols` x `rows` quepa en la pantalla."""
+    width, height = screen.get_size()
+    return max(1, min(width // cols, height // rows))
+
+def cell_rect(pt, size):
+    """Rectángulo en píxeles (x, y, ancho, alto) de la celda `pt`."""
+    return (pt.x * size, pt.y * size, size, size)
+
+def pixel_to_cell(pos, size):
+    """Celda que contiene el píxel `pos` (por ejemplo, la posición del ratón)."""
+    return Point(pos[0] // size, pos[1] // size)
+
+def draw_grid(screen, cols, rows, size):
+    """Dibuja las líneas de la cuadrícula del tablero (mejor una vez, sobre una superficie estática)."""
+    for x in range(cols + 1):
+        pygame.draw.line(screen, COLOR_GRID, (x * size, 0), (x * size, rows * size))
+    for y in range(rows + 1):
+        pygame.draw.line(screen, COLOR_GRID, (0, y * size), (cols * size, y * size))
+
+# Fuentes ya creadas, por tamaño (crear una fuente en cada fotograma es caro)
+_FONTS = {}
+
+def get_font(size):
+    """Fuente por defecto de pygame en el tamaño `size`, creada una sola vez."""
+    font = _FONTS.get(size)
+    if font is None:
+        font = _FONTS[size] = pygame.font.Font(None, size)
+    return font
+
+class GameRenderer:
+    """
+    Dibuja partidas de SnakeGameAI en `screen` redibujando solo lo que cambia.
+    El fondo con las trampas se pre-renderiza en una superficie; en cada paso
+    solo se pintan la cabeza nueva, la cabeza anterior (ahora cuerpo), la celda
+    que deja la cola y la comida nueva. `draw` devuelve los rectángulos
+    modificados para pasarlos a `pygame.display.update`.
+    Si la partida cambia, se saltó algún paso o cambió el puntaje, redibuja todo.
+    """
+    def __init__(self, screen):
+        self.screen = screen
+        self.font = get_font(36)
+        self._background = None
+        self._background_key = None
+        self._game = None
+        self._frame = None
+
+    def _build_background(self, game):
+        """Superficie estática con el fondo y las trampas del tablero de `game`."""
+        key = (game.width, game.height, tuple(game.traps))
+        if key == self._background_key:
+            return
+        self.size = cell_size(self.screen, game.width, game.height)
+        self._background = pygame.Surface(self.screen.get_size()).convert()
+        self._background.fill(COLOR_BACKGROUND)
+        for trap in game.traps:
+            pygame.draw.rect(self._background, COLOR_TRAP, cell_rect(trap, self.size))
+        self._background_key = key
+
+    def draw(self, game):
+        """Dibuja el estado actual de `game` y devuelve la lista de rectángulos modificados."""
+        incremental = (game is self._game and game.frame_iteration == self._frame + 1
+                       and game.score == self._score)
+        if incremental:
+            rects = self._draw_changes(game)
+        else:
+            rects = self._draw_full(game)
+
+        self._game = game
+        self._frame = game.frame_iteration
+        self._head = game.snake[0]
+        self._tail = game.snake[-1]
+        self._food = game.food
+        self._score = game.score
+        return rects
+
+    def _draw_full(self, game):
+        self._build_background(game)
+        self.screen.blit(self._background, (0, 0))
+
+        # Dibujar serpiente
+        for i, pt in enumerate(game.snake):
+            color = COLOR_SNAKE_HEAD if i == 0 else COLOR_SNAKE_BODY
+            pygame.draw.rect(self.screen, color, cell_rect(pt, self.size))
+
+        # Dibujar comida (no hay si la serpiente llenó el tablero)
+        if game.food is not None:
+            pygame.draw.rect(self.screen, COLOR_FOOD, cell_rect(game.food, self.size))
+
+        self._draw_score(game)
+        return [self.screen.get_rect()]
+
+    def _draw_changes(self, game):
+        rects = [
+            # La cabeza anterior pasa a ser cuerpo y aparece la cabeza nueva
+            pygame.draw.rect(self.screen, COLOR_SNAKE_BODY, cell_rect(self._head, self.size)),
+            pygame.draw.rect(self.screen, COLOR_SNAKE_HEAD, cell_rect(game.snake[0], self.size)),
+        ]
+        if game.snake[-1] != self._tail:
+            # La cola avanzó: restaurar el fondo de la celda que dejó libre
+            rect = pygame.Rect(cell_rect(self._tail, self.size))
+            self.screen.blit(self._background, rect, rect)
+            rects.append(rect)
+        if game.food is not None and game.food != self._food:
+            rects.append(pygame.draw.rect(self.screen, COLOR_FOOD, cell_rect(game.food, self.size)))
+
+        # El puntaje va encima de todo: se repinta si alguna celda modificada lo toca
+        if self._score_rect.collidelist(rects) != -1:
+            self._draw_score(game)
+            rects.append(self._score_rect)
+        return rects
+
+    def _draw_score(self, game):
+        text = self.font.render(f"Puntaje: {game.score}", True, COLOR_TEXT)
+        self._score_rect = self.screen.blit(text, [10, 10])
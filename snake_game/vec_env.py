@@ -0,0 +1,157 @@
+import numpy as np
+from .game import Direction
+
+# Códigos de dirección en sentido horario (mismo orden que `clock_wise` en SnakeGameAI),
+# así girar a la derecha es +1 y girar a la izquierda es -1 (módulo 4).
+DIRECTIONS = [Direction.RIGHT, Direction.DOWN, Direction.LEFT, Direction.UP]
+DIR_DX = np.array([1, 0, -1, 0], dtype=np.int64)
+DIR_DY = np.array([0, 1, 0, -1], dtype=np.int64)
+
+# Cambio de dirección asociado a cada índice de acción: [recto, derecha, izquierda]
+ACTION_TURN = np.array([0, 1, -1], dtype=np.int64)
+
+# Valores de la cuadrícula de ocupación
+CELL_FREE = 0
+CELL_SNAKE = 1
+CELL_TRAP = 2
+
+class VecSnakeEnv:
+    """
+    Entorno sin interfaz gráfica que simula N partidas de Snake a la vez.
+    Todos los tableros se guardan como arrays de NumPy (cuadrículas de ocupación,
+    cuerpos en buffers circulares de celdas, direcciones y comida) y se avanzan
+    juntos con una única llamada vectorizada a `step`. Las partidas que terminan
+    se reinician automáticamente.
+
+    Las reglas son las mismas que en SnakeGameAI: chocar con la pared, el cuerpo
+    (incluida la cola actual) o una trampa da -10 y termina la partida; comer da +10.
+    """
+    def __init__(self, num_envs, width, height, start_pos, traps, seed=None):
+        self.num_envs = num_envs
+        # Dimensiones y posiciones en celdas, igual que en SnakeGameAI
+        self.cols = int(width)
+        self.rows = int(height)
+        self.n_cells = self.cols * self.rows
+        self.start_x = int(start_pos.x)
+        self.start_y = int(start_pos.y)
+        self.rng = np.random.default_rng(seed)
+
+        # Máscara de trampas (compartida por todos los tableros) y valor "de fondo" de cada celda
+        self.trap_mask = np.zeros(self.n_cells, dtype=np.bool_)
+        for trap in traps:
+            self.trap_mask[int(trap.y) * self.cols + int(trap.x)] = True
+        self._background = np.where(self.trap_mask, CELL_TRAP, CELL_FREE).astype(np.int8)
+
+        # Estado de las N partidas
+        self.grid = np.zeros((num_envs, self.n_cells), dtype=np.int8)
+        self.capacity = self.n_cells + 3  # Longitud máxima del cuerpo (+ segmentos iniciales fuera del tablero)
+        self.body = np.full((num_envs, self.capacity), -1, dtype=np.int64)  # -1 = segmento fuera del tablero
+        self.head_ptr = np.zeros(num_envs, dtype=np.int64)
+        self.tail_ptr = np.zeros(num_envs, dtype=np.int64)
+        self.length = np.zeros(num_envs, dtype=np.int64)
+        self.head_x = np.zeros(num_envs, dtype=np.int64)
+        self.head_y = np.zeros(num_envs, dtype=np.int64)
+        self.direction = np.zeros(num_envs, dtype=np.int64)
+        self.food = np.full(num_envs, -1, dtype=np.int64)  # Celda de la comida (-1 si el tablero está lleno)
+        self.scores = np.zeros(num_envs, dtype=np.int64)
+
+        self.reset()
+
+    def reset(self, idx=None):
+        """Reinicia las partidas indicadas (todas si `idx` es None) a su estado inicial."""
+        if idx is None:
+            idx = np.arange(self.num_envs)
+        if len(idx) == 0:
+            return
+
+        self.grid[idx] = self._background
+        self.body[idx] = -1
+
+        # Serpiente inicial de 3 segmentos mirando a la derecha: [cola, medio, cabeza]
+        for k, x in enumerate((self.start_x - 2, self.start_x - 1, self.start_x)):
+            if 0 <= x < self.cols and 0 <= self.start_y < self.rows:
+                cell = self.start_y * self.cols + x
+                self.body[idx, k] = cell
+                self.grid[idx, cell] = CELL_SNAKE
+
+        self.tail_ptr[idx] = 0
+        self.head_ptr[idx] = 2
+        self.length[idx] = 3
+        self.head_x[idx] = self.start_x
+        self.head_y[idx] = self.start_y
+        self.direction[idx] = 0  # Direction.RIGHT
+        self.scores[idx] = 0
+        self._place_food(idx)
+
+    def is_blocked(self, x, y):
+        """Indica, para cada partida, si la celda (x, y) es pared, cuerpo o trampa."""
+        out = (x < 0) | (x >= self.cols) | (y < 0) | (y >= self.rows)
+        cell = np.where(out, 0, y * self.cols + x)
+        return out | (self.grid[np.arange(self.num_envs), cell] != CELL_FREE)
+
+    def _place_food(self, idx):
+        """
+        Coloca comida en una celda libre elegida uniformemente en cada partida de `idx`.
+        Devuelve una máscara con las partidas cuyo tablero no tiene celdas libres.
+        """
+        free = self.grid[idx] == CELL_FREE
+        # Clave aleatoria por celda; las ocupadas nunca ganan el argmax
+        keys = self.rng.random(free.shape)
+        keys[~free] = -1.0
+        has_free = free.any(axis=1)
+        self.food[idx] = np.where(has_free, keys.argmax(axis=1), -1)
+        return ~has_free
+
+    def step(self, actions):
+        """
+        Avanza todas las partidas un paso.
+        `actions` puede ser un array de índices (0 recto, 1 derecha, 2 izquierda)
+        o de vectores one-hot de forma (N, 3).
+        Devuelve (rewards, dones, scores); `scores` es el puntaje alcanzado en este
+        paso, antes del reinicio automático de las partidas terminadas.
+        """
+        actions = np.asarray(actions)
+        if actions.ndim == 2:
+            actions = actions.argmax(axis=1)
+
+        # 1. Nueva dirección y nueva posición de la cabeza
+        self.direction = (self.direction + ACTION_TURN[actions]) % 4
+        nx = self.head_x + DIR_DX[self.direction]
+        ny = self.head_y + DIR_DY[self.direction]
+        out = (nx < 0) | (nx >= self.cols) | (ny < 0) | (ny >= self.rows)
+        cell = np.where(out, 0, ny * self.cols + nx)
+
+        # 2. Colisiones: la cola todavía ocupa su celda, como en SnakeGameAI
+        dones = self.is_blocked(nx, ny)
+        rewards = np.where(dones, -10, 0)
+
+        # 3. Avanzar la cabeza en las partidas que siguen vivas
+        alive = np.nonzero(~dones)[0]
+        new_cells = cell[alive]
+        self.head_ptr[alive] = (self.head_ptr[alive] + 1) % self.capacity
+        self.body[alive, self.head_ptr[alive]] = new_cells
+        self.grid[alive, new_cells] = CELL_SNAKE
+        self.head_x[alive] = nx[alive]
+        self.head_y[alive] = ny[alive]
+
+        # 4. Comer o retraer la cola
+        ate_mask = self.food[alive] == new_cells
+        ate = alive[ate_mask]
+        self.scores[ate] += 1
+        self.length[ate] += 1
+        rewards[ate] = 10
+
+        moved = alive[~ate_mask]
+        tails = self.body[moved, self.tail_ptr[moved]]
+        on_board = tails >= 0
+        self.grid[moved[on_board], tails[on_board]] = self._background[tails[on_board]]
+        self.body[moved, self.tail_ptr[moved]] = -1
+        self.tail_ptr[moved] = (self.tail_ptr[moved] + 1) % self.capacity
+
+        # 5. Nueva comida; si el tablero está lleno la partida termina (se ha ganado)
+        full = self._place_food(ate)
+        dones[ate[full]] = True
+
+        scores = self.scores.copy()
+        self.reset(np.nonzero(dones)[0])
+        return rewards, dones, scores
@@ -0,0 +1,80 @@
+"""
+Comprueba que las estructuras incrementales de agent/encoders.py coinciden con
+recalcularlas desde cero recorriendo el tablero en cada paso.
+"""
+import random
+import numpy as np
+
+from agent.encoders import OccupancyGrid, RayDistanceField, RAY_DIRECTIONS
+from config import Point
+from snake_game.game import SnakeGameAI, Direction
+from snake_game.layouts import generate_layout, game_kwargs
+
+def _blocked(game, x, y):
+    if x < 0 or x >= game.width or y < 0 or y >= game.height:
+        return True
+    return (x, y) in game.trap_set or (x, y) in game.snake
+
+def _brute_force_dist(game):
+    """Distancias al primer obstáculo recorriendo cada rayo celda a celda."""
+    dist = np.zeros((len(RAY_DIRECTIONS), game.height, game.width), dtype=np.int64)
+    for i, (dx, dy) in enumerate(RAY_DIRECTIONS):
+        for y in range(game.height):
+            for x in range(game.width):
+                k = 1
+                while not _blocked(game, x + k * dx, y + k * dy):
+                    k += 1
+                dist[i, y, x] = k
+    return dist
+
+ACTIONS = ([1, 0, 0], [0, 1, 0], [0, 0, 1])
+CLOCK_WISE = [Direction.RIGHT, Direction.DOWN, Direction.LEFT, Direction.UP]
+DELTAS = {Direction.RIGHT: (1, 0), Direction.DOWN: (0, 1), Direction.LEFT: (-1, 0), Direction.UP: (0, -1)}
+
+def _random_action(game, rng):
+    """Acción al azar que no choca si hay alguna, para que las partidas duren y la serpiente crezca."""
+    idx = CLOCK_WISE.index(game.direction)
+    safe = []
+    for action, turn in zip(ACTIONS, (0, 1, -1)):
+        dx, dy = DELTAS[CLOCK_WISE[(idx + turn) % 4]]
+        pt = Point(game.head.x + dx, game.head.y + dy)
+        # La cola cuenta como choque: el juego comprueba la colisión antes de mover la cola
+        if game.collision_cause(pt) is None:
+            safe.append(action)
+    return rng.choice(safe or ACTIONS)
+
+def _play_random_games(n_games, seed, max_steps=300):
+    """
+    Juega partidas en tableros aleatorios con trampas y devuelve la partida
+    antes de cada paso (el estado tras el choque final no se comprueba).
+    """
+    rng = random.Random(seed)
+    for episode in range(n_games):
+        layout = generate_layout(rng.randrange(4, 12), rng.randrange(3, 10), rng.randrange(0, 8), rng)
+        game = SnakeGameAI(**game_kwargs(layout), seed=episode)
+        for _ in range(max_steps):
+            yield game
+            _, done, _ = game.play_step(_random_action(game, rng))
+            if done:
+                break
+
+def test_ray_distance_field_matches_brute_force():
+    current = field = None
+    steps = longest = 0
+    for game in _play_random_games(20, seed=0):
+        if game is not current:
+            current, field = game, RayDistanceField(game)
+        np.testing.assert_array_equal(field.dist, _brute_force_dist(game))
+        steps += 1
+        longest = max(longest, len(game.snake))
+    # Cubrir también las celdas que se ocupan sin liberar la cola (al comer)
+    assert steps > 1000 and longest > 8
+
+def test_occupancy_grid_matches_board():
+    current = grid = None
+    for game in _play_random_games(20, seed=1):
+        if game is not current:
+            current, grid = game, OccupancyGrid(game, pad=2)
+        expected = np.array([[_blocked(game, x, y) for x in range(-2, game.width + 2)]
+                             for y in range(-2, game.height + 2)])
+        np.testing.assert_array_equal(grid.blocked, expected)
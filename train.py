@@ -1,43 +1,103 @@
+import argparse
 import pygame
 
 # Importaciones de nuestro proyecto
 from agent.dql_agent import Agent
+from agent.checkpoint import save_checkpoint, load_checkpoint
+from agent.curriculum import CurriculumScheduler
+from agent.encoders import make_encoder
 from snake_game.game import SnakeGameAI, Point
-from utils.plot import save_plot # Usamos nuestra utilidad de graficado con Plotly
+from snake_game.layouts import game_kwargs
+from snake_game.recording import EpisodeRecorder
+from snake_game.render import GameRenderer
+from utils.plot import ProgressPlotter # Gráfico de progreso con Plotly, generado en segundo plano
+from utils.metrics import MetricsLogger
+from utils.stats import ScoreTracker
+from utils.seeding import derive_seed, seed_everything
 from config import (
-    SCREEN_WIDTH, SCREEN_HEIGHT, GAME_SPEED_AGENT, NUM_EPISODES,
-    MODEL_FILE_NAME
+    SCREEN_WIDTH, SCREEN_HEIGHT, BOARD_WIDTH, BOARD_HEIGHT, GAME_SPEED_AGENT, NUM_EPISODES,
+    MODEL_FILE_NAME, NUM_WORKERS, WEIGHT_SYNC_INTERVAL, NUM_ENVS,
+    TRAIN_SHORT_MEMORY, CHECKPOINT_INTERVAL, PLOT_INTERVAL, SEED, RECORD_FILE_PATH, OBSERVATION_ENCODER
 )
 
 # --- Configuración de la Visualización ---
 VISUALIZE_TRAINING = False  # Cambia a True si quieres ver el entrenamiento en tiempo real
 
-def train():
+def _resume(agent, tracker, curriculum=None):
+    """
+    Restaura el último checkpoint en `agent`, las estadísticas de puntajes en
+    `tracker` y, si se entrena con currículo, la etapa alcanzada.
+    """
+    progress = load_checkpoint(agent)
+    if curriculum is not None and 'curriculum' in progress:
+        curriculum.load_state_dict(progress['curriculum'])
+    tracker.load_state_dict(progress['tracker'])
+    print(f"Entrenamiento reanudado desde la partida {agent.n_games}.")
+
+def _checkpoint(agent, tracker, curriculum=None):
+    """Guarda el checkpoint completo (modelo, optimizador, memoria, estadísticas y currículo)."""
+    progress = {'tracker': tracker.state_dict()}
+    if curriculum is not None:
+        progress['curriculum'] = curriculum.state_dict()
+    save_checkpoint(agent, progress)
+
+def _new_game(seed, n_games, curriculum=None):
+    """
+    Crea la partida número `n_games`: en el tablero completo con inicio centrado,
+    o en un tablero aleatorio de la etapa actual si se entrena con currículo.
+    Cada partida recibe su propia semilla, derivada de la base y del número de partida.
+    """
+    game_seed = derive_seed(seed, 'game', n_games)
+    if curriculum is not None:
+        return SnakeGameAI(**game_kwargs(curriculum.next_layout()), seed=game_seed)
+    start_pos = Point(BOARD_WIDTH // 2, BOARD_HEIGHT // 2)
+    return SnakeGameAI(width=BOARD_WIDTH, height=BOARD_HEIGHT, start_pos=start_pos, traps=[], seed=game_seed)
+
+def _report(agent, score, tracker):
+    """Imprime el progreso de la partida recién terminada en la consola."""
+    print(f'Partida: {agent.n_games}, Puntaje: {score}, Récord: {tracker.record}, '
+          f'Media móvil: {tracker.moving_average:.2f}')
+
+def train(resume=False, seed=SEED, curriculum=False, record=None):
     """
     Función principal que ejecuta el bucle de entrenamiento completo.
     Orquesta la interacción entre el agente y el entorno del juego,
     registra el progreso y guarda tanto el modelo como los gráficos.
+    Con `resume=True` continúa desde el último checkpoint guardado.
+    Con `seed`, dos ejecuciones con la misma semilla siguen la misma trayectoria.
+    Con `curriculum=True` se entrena por etapas de dificultad (ver CURRICULUM_STAGES).
+    Con `record` (ruta de archivo) se graban todas las partidas (ver snake_game/recording.py).
     """
-    # --- Listas para el seguimiento de métricas ---
-    scores = []
-    mean_scores = []
-    total_score = 0
-    record_score = 0
+    seed_everything(seed)
+    scheduler = CurriculumScheduler(seed=derive_seed(seed, 'curriculum')) if curriculum else None
+
+    # --- Seguimiento de métricas (memoria acotada aunque el entrenamiento sea muy largo) ---
+    tracker = ScoreTracker()
+    plotter = ProgressPlotter()
     
     # --- Inicialización del Agente y el Entorno ---
-    agent = Agent()
-    
-    start_pos = Point(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2)
-    traps = [] 
-    game = SnakeGameAI(width=SCREEN_WIDTH, height=SCREEN_HEIGHT, start_pos=start_pos, traps=traps)
+    agent = Agent(seed=seed)
+    if resume:
+        _resume(agent, tracker, scheduler)
+    game = _new_game(seed, agent.n_games, scheduler)
+    recorder = EpisodeRecorder(record) if record else None
+    if recorder is not None and agent.n_games < NUM_EPISODES:
+        recorder.start(game)
 
     # --- Inicialización de Pygame (si se visualiza) ---
     if VISUALIZE_TRAINING:
         pygame.init()
         screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         pygame.display.set_caption("Snake Game - Entrenamiento DQL")
+        renderer = GameRenderer(screen)
         clock = pygame.time.Clock()
 
+    # Registro de métricas por fase del bucle (ver config.py)
+    metrics = MetricsLogger()
+
+    # Estado inicial; en cada paso se reutiliza el estado posterior como el siguiente estado actual
+    state_old = agent.get_state(game)
+
     # --- Bucle de Entrenamiento Principal ---
     while agent.n_games < NUM_EPISODES:
         
@@ -49,70 +109,285 @@ def train():
 
         # --- Interacción Agente-Entorno ---
         
-        # 1. Obtener el estado actual del juego
-        state_old = agent.get_state(game)
+        # 1. El estado actual del juego ya está en `state_old`
 
         # 2. El agente decide una acción basada en el estado actual
-        final_move = agent.get_action(state_old)
+        with metrics.phase('act'):
+            final_move = agent.get_action(state_old)
 
         # 3. El entorno ejecuta la acción y devuelve los resultados
         # ESTA LÍNEA DEFINE reward, done, y score.
-        reward, done, score = game.play_step(final_move)
+        with metrics.phase('env'):
+            reward, done, score = game.play_step(final_move)
+        if recorder is not None:
+            with metrics.phase('record'):
+                recorder.step(game, final_move)
         
         # 4. Obtener el nuevo estado después de la acción
-        state_new = agent.get_state(game)
+        with metrics.phase('encode'):
+            state_new = agent.get_state(game)
 
-        # 5. Entrenar al agente en el paso inmediato (memoria a corto plazo)
-        agent.train_short_memory(state_old, final_move, reward, state_new, done)
+        # 5. Entrenar al agente en el paso inmediato (memoria a corto plazo, opcional)
+        if TRAIN_SHORT_MEMORY:
+            with metrics.phase('short_train'):
+                agent.train_short_memory(state_old, final_move, reward, state_new, done)
 
         # 6. Almacenar la transición (s, a, r, s') en la memoria de repetición
-        agent.remember(state_old, final_move, reward, state_new, done)
+        with metrics.phase('remember'):
+            agent.remember(state_old, final_move, reward, state_new, done)
+
+        # 7. Actualizaciones programadas con minilotes de la memoria (ver config.py)
+        with metrics.phase('scheduled_train'):
+            agent.scheduled_update()
 
         # --- Lógica de Fin de Partida ---
         if done:
             # Acciones cuando la partida termina:
             
-            # a) Reiniciar el juego para el siguiente episodio
-            game = SnakeGameAI(width=SCREEN_WIDTH, height=SCREEN_HEIGHT, start_pos=start_pos, traps=traps)
+            # a) Con currículo, pasar de etapa si la media reciente alcanza el umbral
+            if scheduler is not None and scheduler.record(score):
+                stage = scheduler.stage
+                print(f"Currículo: etapa {scheduler.stage_index + 1}/{len(scheduler.stages)} "
+                      f"({stage['width']}x{stage['height']}, trampas {stage['trap_density']:.0%}).")
+
+            # b) Contar la partida terminada y reiniciar el juego para el siguiente episodio
+            # (se cuenta antes para que cada partida reciba su propia semilla)
             agent.n_games += 1
+            if recorder is not None:
+                recorder.end(game)
+            game = _new_game(seed, agent.n_games, scheduler)
+            if recorder is not None and agent.n_games < NUM_EPISODES:
+                # Tras la última partida no se graba la siguiente (no se llega a jugar)
+                recorder.start(game)
+            state_new = agent.get_state(game)
             
-            # b) Entrenar la memoria a largo plazo con un lote de experiencias pasadas
-            agent.train_long_memory()
+            # c) Entrenar la memoria a largo plazo con un lote de experiencias pasadas
+            with metrics.phase('long_train'):
+                agent.train_long_memory()
 
-            # c) Comprobar si se ha batido un nuevo récord
-            if score > record_score:
-                record_score = score
+            # d) Actualizar las estadísticas y comprobar si se ha batido un nuevo récord
+            if tracker.add(score):
                 # Guardar el modelo solo cuando mejora
-                agent.model.save(file_name=MODEL_FILE_NAME)
-                print(f"¡Nuevo récord! Puntaje: {record_score}. Modelo guardado.")
+                with metrics.phase('save_model'):
+                    agent.model.save(file_name=MODEL_FILE_NAME, target_model=agent.target_model)
+                print(f"¡Nuevo récord! Puntaje: {tracker.record}. Modelo guardado.")
 
-            # d) Imprimir progreso en la consola
-            print(f'Partida: {agent.n_games}, Puntaje: {score}, Récord: {record_score}')
-
-            # e) Actualizar las métricas para el graficado
-            scores.append(score)
-            total_score += score
-            mean_score = total_score / agent.n_games
-            mean_scores.append(mean_score)
+            # e) Imprimir progreso en la consola
+            _report(agent, score, tracker)
             
-            # f) Generar y guardar el gráfico a intervalos para no ralentizar el proceso
-            if agent.n_games % 25 == 0 and agent.n_games > 0:
-                save_plot(scores, mean_scores)
+            # f) Pedir el gráfico a intervalos (se genera en segundo plano, sin frenar el bucle)
+            if agent.n_games % PLOT_INTERVAL == 0 and agent.n_games > 0:
+                with metrics.phase('plot'):
+                    plotter.request_plot(tracker)
+
+            # g) Guardar el checkpoint completo para poder reanudar
+            if agent.n_games % CHECKPOINT_INTERVAL == 0:
+                with metrics.phase('checkpoint'):
+                    _checkpoint(agent, tracker, scheduler)
+
+        state_old = state_new
+        metrics.step(agent, n_games=int(done), record_score=tracker.record)
 
         # --- Actualización de la Pantalla (si se visualiza) ---
         if VISUALIZE_TRAINING:
-            game.draw(screen)
-            pygame.display.flip()
+            with metrics.phase('render'):
+                # Solo se actualizan en pantalla las celdas que cambiaron
+                pygame.display.update(renderer.draw(game))
             clock.tick(GAME_SPEED_AGENT)
 
     # --- Acciones Finales al Terminar el Entrenamiento ---
     print("Entrenamiento finalizado.")
     # Guardar la gráfica final con todos los datos
-    save_plot(scores, mean_scores)
+    plotter.close(tracker)
+    _checkpoint(agent, tracker, scheduler)
+    metrics.close(agent, **tracker.summary())
+    if recorder is not None:
+        recorder.close()
 
     if VISUALIZE_TRAINING:
         pygame.quit()
 
+def train_vectorized(num_envs=NUM_ENVS, resume=False, seed=SEED):
+    """
+    Variante del entrenamiento que avanza `num_envs` partidas a la vez con
+    VecSnakeEnv. Los estados de todas las partidas se codifican en lote, la red
+    elige todas las acciones con una sola pasada y cada paso del vector de
+    entornos produce un único paso de entrenamiento sobre todas las transiciones.
+    Al reanudar, las partidas en curso empiezan de nuevo.
+    """
+    from snake_game.vec_env import VecSnakeEnv
+
+    # Comprobar el codificador antes de crear el agente (y su memoria de repetición)
+    if not make_encoder().batched:
+        raise ValueError(f"El entrenamiento vectorizado requiere un codificador en lote ('basic'), "
+                         f"no {OBSERVATION_ENCODER!r}")
+
+    seed_everything(seed)
+    tracker = ScoreTracker()
+    plotter = ProgressPlotter()
+
+    agent = Agent(seed=seed)
+    if resume:
+        _resume(agent, tracker)
+    start_pos = Point(BOARD_WIDTH // 2, BOARD_HEIGHT // 2)
+    env = VecSnakeEnv(num_envs, width=BOARD_WIDTH, height=BOARD_HEIGHT, start_pos=start_pos, traps=[],
+                      seed=derive_seed(seed, 'env', agent.n_games))
+    print(f"Entrenando con {num_envs} partidas simultáneas.")
+
+    metrics = MetricsLogger()
+    states = agent.get_states(env)
+    while agent.n_games < NUM_EPISODES:
+        # 1. Acciones para todas las partidas en una sola pasada
+        with metrics.phase('act'):
+            actions = agent.get_actions(states)
+
+        # 2. Avanzar todos los entornos (las partidas terminadas se reinician solas)
+        with metrics.phase('env'):
+            rewards, dones, step_scores = env.step(actions)
+
+        # 3. Codificar los nuevos estados una sola vez: sirven como s' de esta
+        # transición y como s del siguiente paso. En las partidas reiniciadas s'
+        # es el estado inicial de la nueva partida, pero `done` lo anula en el target.
+        with metrics.phase('encode'):
+            next_states = agent.get_states(env)
+
+        # 4. Memoria a corto plazo (en lote), memoria de repetición y actualizaciones programadas
+        if TRAIN_SHORT_MEMORY:
+            with metrics.phase('short_train'):
+                agent.train_short_memory(states, actions, rewards, next_states, dones)
+        with metrics.phase('remember'):
+            agent.memory.push_batch(states, actions, rewards, next_states, dones)
+        with metrics.phase('scheduled_train'):
+            agent.scheduled_update(num_envs)
+        states = next_states
+
+        # 5. Fin de partida para los entornos terminados
+        for score in step_scores[dones].tolist():
+            agent.n_games += 1
+            with metrics.phase('long_train'):
+                agent.train_long_memory()
+
+            if tracker.add(score):
+                with metrics.phase('save_model'):
+                    agent.model.save(file_name=MODEL_FILE_NAME, target_model=agent.target_model)
+                print(f"¡Nuevo récord! Puntaje: {tracker.record}. Modelo guardado.")
+
+            _report(agent, score, tracker)
+
+            if agent.n_games % PLOT_INTERVAL == 0:
+                with metrics.phase('plot'):
+                    plotter.request_plot(tracker)
+
+            if agent.n_games % CHECKPOINT_INTERVAL == 0:
+                with metrics.phase('checkpoint'):
+                    _checkpoint(agent, tracker)
+
+            if agent.n_games >= NUM_EPISODES:
+                break
+
+        metrics.step(agent, n_steps=num_envs, n_games=int(dones.sum()), record_score=tracker.record)
+
+    print("Entrenamiento finalizado.")
+    plotter.close(tracker)
+    _checkpoint(agent, tracker)
+    metrics.close(agent, **tracker.summary())
+
+def train_parallel(num_workers=NUM_WORKERS, resume=False, seed=SEED):
+    """
+    Variante del entrenamiento con varios procesos actores.
+    Cada actor juega sus propias partidas con una copia de la red que se
+    sincroniza periódicamente; este proceso actúa como aprendiz central:
+    recibe las transiciones en la memoria de repetición y entrena el modelo.
+    """
+    from agent.parallel import ParallelRollout
+
+    seed_everything(seed)
+    tracker = ScoreTracker()
+    plotter = ProgressPlotter()
+
+    agent = Agent(seed=seed)
+    if resume:
+        _resume(agent, tracker)
+    start_pos = Point(BOARD_WIDTH // 2, BOARD_HEIGHT // 2)
+    game_kwargs = dict(width=BOARD_WIDTH, height=BOARD_HEIGHT, start_pos=start_pos, traps=[])
+
+    rollout = ParallelRollout(num_workers, game_kwargs, seed=derive_seed(seed, 'actors', agent.n_games))
+    rollout.start(agent.model, agent.n_games)
+    print(f"Entrenando con {num_workers} actores en paralelo.")
+
+    metrics = MetricsLogger()
+    try:
+        while agent.n_games < NUM_EPISODES:
+            # 1. Recibir un bloque de experiencia de cualquier actor
+            with metrics.phase('wait_actors'):
+                states, actions, rewards, next_states, dones, finished = rollout.get()
+            with metrics.phase('remember'):
+                agent.memory.push_batch(states, actions, rewards, next_states, dones)
+            with metrics.phase('scheduled_train'):
+                agent.scheduled_update(len(actions))
+
+            # 2. Por cada partida terminada, entrenar y registrar el progreso
+            for score in finished:
+                agent.n_games += 1
+                agent.epsilon = rollout.epsilon  # Los actores calculan su propio épsilon
+                with metrics.phase('long_train'):
+                    agent.train_long_memory()
+
+                if tracker.add(score):
+                    with metrics.phase('save_model'):
+                        agent.model.save(file_name=MODEL_FILE_NAME, target_model=agent.target_model)
+                    print(f"¡Nuevo récord! Puntaje: {tracker.record}. Modelo guardado.")
+
+                _report(agent, score, tracker)
+
+                if agent.n_games % WEIGHT_SYNC_INTERVAL == 0:
+                    with metrics.phase('sync_weights'):
+                        rollout.sync_weights(agent.model, agent.n_games)
+
+                if agent.n_games % PLOT_INTERVAL == 0:
+                    with metrics.phase('plot'):
+                        plotter.request_plot(tracker)
+
+                if agent.n_games % CHECKPOINT_INTERVAL == 0:
+                    with metrics.phase('checkpoint'):
+                        _checkpoint(agent, tracker)
+
+                if agent.n_games >= NUM_EPISODES:
+                    break
+
+            metrics.step(agent, n_steps=len(actions), n_games=len(finished), record_score=tracker.record)
+    finally:
+        rollout.close()
+
+    print("Entrenamiento finalizado.")
+    plotter.close(tracker)
+    _checkpoint(agent, tracker)
+    metrics.close(agent, **tracker.summary())
+
 # --- Punto de Entrada del Script ---
 if __name__ == '__main__':
-    train()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description='Entrenamiento del agente DQL para Snake.')
+    parser.add_argument('--workers', type=int, default=0, nargs='?', const=NUM_WORKERS,
+                        help=f'Número de procesos actores en paralelo (sin valor: {NUM_WORKERS}; 0: un solo proceso).')
+    parser.add_argument('--envs', type=int, default=0, nargs='?', const=NUM_ENVS,
+                        help=f'Número de partidas simultáneas con el entorno vectorizado (sin valor: {NUM_ENVS}).')
+    parser.add_argument('--resume', action='store_true',
+                        help='Reanudar desde el último checkpoint completo.')
+    parser.add_argument('--curriculum', action='store_true',
+                        help='Entrenar por etapas de tablero y trampas (solo en el modo de un proceso).')
+    parser.add_argument('--seed', type=int, default=SEED,
+                        help='Semilla para un entrenamiento reproducible (por defecto SEED de config.py).')
+    parser.add_argument('--record', nargs='?', const=RECORD_FILE_PATH,
+                        help=f'Grabar las partidas en este archivo (sin valor: {RECORD_FILE_PATH}; solo en el modo de un proceso).')
+    args = parser.parse_args()
+    if args.curriculum and (args.workers > 0 or args.envs > 0):
+        parser.error('--curriculum solo está disponible en el modo de un proceso.')
+    if args.record and (args.workers > 0 or args.envs > 0):
+        parser.error('--record solo está disponible en el modo de un proceso.')
+
+    if args.workers > 0:
+        train_parallel(args.workers, resume=args.resume, seed=args.seed)
+    elif args.envs > 0:
+        train_vectorized(args.envs, resume=args.resume, seed=args.seed)
+    else:
+        train(resume=args.resume, seed=args.seed, curriculum=args.curriculum, record=args.record)
\ No newline at end of file
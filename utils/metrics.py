@@ -0,0 +1,91 @@
+import json
+import os
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+from config import METRICS_ENABLED, METRICS_FILE_PATH, METRICS_FLUSH_SECONDS
+
+class MetricsLogger:
+    """
+    Instrumentación del bucle de entrenamiento.
+    Acumula el tiempo de cada fase (actuar, paso del entorno, entrenamiento,
+    guardado, gráficos...) y escribe cada `flush_seconds` una línea JSON con los
+    totales del intervalo: pasos/s, pérdida, épsilon, estadísticas de Q-valores,
+    ocupación de la memoria y milisegundos por fase.
+    """
+    def __init__(self, path=METRICS_FILE_PATH, flush_seconds=METRICS_FLUSH_SECONDS, enabled=METRICS_ENABLED):
+        self.enabled = enabled
+        self.flush_seconds = flush_seconds
+        self.file = None
+        if enabled:
+            folder = os.path.dirname(path)
+            if folder and not os.path.exists(folder):
+                os.makedirs(folder)
+            self.file = open(path, 'a')
+
+        self.start_time = time.perf_counter()
+        self._reset_interval()
+
+    def _reset_interval(self):
+        self.interval_start = time.perf_counter()
+        self.phase_seconds = defaultdict(float)
+        self.steps = 0
+        self.games = 0
+
+    @contextmanager
+    def phase(self, name):
+        """Mide el tiempo del bloque y lo suma a la fase `name`."""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phase_seconds[name] += time.perf_counter() - start
+
+    def step(self, agent, n_steps=1, n_games=0, **extra):
+        """
+        Registra `n_steps` pasos del entorno y `n_games` partidas terminadas,
+        y escribe una línea si ya pasó el intervalo de volcado.
+        """
+        if not self.enabled:
+            return
+        self.steps += n_steps
+        self.games += n_games
+        if time.perf_counter() - self.interval_start >= self.flush_seconds:
+            self.flush(agent, **extra)
+
+    def flush(self, agent, **extra):
+        """Escribe una línea con las métricas del intervalo actual y lo reinicia."""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        interval = max(now - self.interval_start, 1e-9)
+        train = agent.pop_train_stats()
+        record = {
+            'time': time.time(),
+            'elapsed_s': round(now - self.start_time, 3),
+            'interval_s': round(interval, 3),
+            'n_games': agent.n_games,
+            'env_steps': agent.env_steps,
+            'steps_per_sec': round(self.steps / interval, 2),
+            'games_per_sec': round(self.games / interval, 4),
+            'epsilon': agent.epsilon,
+            'buffer_fill': len(agent.memory) / agent.memory.capacity,
+            **train,
+            'phase_ms': {name: round(seconds * 1000, 3) for name, seconds in self.phase_seconds.items()},
+            **extra,
+        }
+        self.file.write(json.dumps(record) + '\n')
+        self.file.flush()
+        self._reset_interval()
+
+    def close(self, agent=None, **extra):
+        """Vuelca lo pendiente y cierra el archivo."""
+        if not self.enabled:
+            return
+        if agent is not None and self.steps > 0:
+            self.flush(agent, **extra)
+        self.file.close()
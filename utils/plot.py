@@ -1,11 +1,14 @@
 import plotly.graph_objects as go
 import os
-from typing import List
+import queue
+import threading
+from typing import List, Optional
 
 # Importamos la ruta de la carpeta desde el archivo de configuración central
-from config import PLOT_FOLDER_PATH
+from config import PLOT_FOLDER_PATH, PLOT_IN_BACKGROUND
 
-def save_plot(scores: List[float], mean_scores: List[float]):
+def save_plot(scores: List[float], mean_scores: List[float],
+              game_numbers: Optional[List[int]] = None, bucket_size: int = 1):
 
     # Asegurarse de que la carpeta de destino exista
     if not os.path.exists(PLOT_FOLDER_PATH):
@@ -14,8 +17,9 @@ def save_plot(scores: List[float], mean_scores: List[float]):
     # Crear una nueva figura de Plotly
     fig = go.Figure()
 
-    # Eje X: Número de partidas (empezando desde 1)
-    game_numbers = list(range(1, len(scores) + 1))
+    # Eje X: Número de partidas (empezando desde 1), salvo que los datos vengan agrupados
+    if game_numbers is None:
+        game_numbers = list(range(1, len(scores) + 1))
 
     # --- Añadir Trazas (las líneas del gráfico) ---
 
@@ -24,7 +28,7 @@ def save_plot(scores: List[float], mean_scores: List[float]):
         x=game_numbers, 
         y=scores,
         mode='lines',
-        name='Puntaje por Partida',
+        name='Puntaje por Partida' if bucket_size == 1 else f'Puntaje Medio (cada {bucket_size} partidas)',
         line=dict(color='rgba(67, 160, 239, 0.8)') # Un azul suave
     ))
 
@@ -68,4 +72,65 @@ def save_plot(scores: List[float], mean_scores: List[float]):
     except ValueError as e:
         print("\nADVERTENCIA: No se pudo guardar la imagen estática (.png).")
         print("Asegúrate de tener 'kaleido' instalado: pip install kaleido")
-        print(f"Error original: {e}")
\ No newline at end of file
+        print(f"Error original: {e}")
+
+class ProgressPlotter:
+    """
+    Genera el gráfico de progreso fuera del bucle de entrenamiento.
+    Recibe instantáneas del historial reducido de un ScoreTracker (como mucho
+    PLOT_MAX_POINTS puntos por línea, así que copiarlas es barato) y, con
+    `background=True`, un hilo trabajador escribe el HTML/PNG mientras el
+    entrenamiento sigue. Si se piden varios gráficos mientras se dibuja uno,
+    se genera solo el más reciente.
+    """
+    def __init__(self, background=PLOT_IN_BACKGROUND):
+        self.background = background
+        if background:
+            self._queue = queue.Queue()
+            self._thread = threading.Thread(target=self._run, name='plot-worker', daemon=True)
+            self._thread.start()
+
+    def request_plot(self, tracker):
+        """Pide generar el gráfico con el historial actual de `tracker`."""
+        snapshot = tracker.history.snapshot()
+        if self.background:
+            self._queue.put(('plot', snapshot))
+        else:
+            self._render(snapshot)
+
+    def close(self, tracker=None):
+        """Genera el gráfico final (si se pasa `tracker`) y espera a que el hilo trabajador termine."""
+        if tracker is not None:
+            self.request_plot(tracker)
+        if self.background:
+            self._queue.put(('stop', None))
+            self._thread.join()
+
+    @staticmethod
+    def _render(snapshot):
+        game_numbers, scores, mean_scores, bucket_size = snapshot
+        if scores:
+            save_plot(scores, mean_scores, game_numbers=game_numbers, bucket_size=bucket_size)
+
+    def _run(self):
+        while True:
+            kind, snapshot = self._queue.get()
+            stop = kind == 'stop'
+            latest = snapshot
+            # Quedarse solo con la instantánea más reciente de las que esperan en la cola
+            while not stop:
+                try:
+                    kind, snapshot = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if kind == 'stop':
+                    stop = True
+                else:
+                    latest = snapshot
+            if latest is not None:
+                try:
+                    self._render(latest)
+                except Exception as e:  # Un fallo al graficar no debe detener el hilo
+                    print(f"ADVERTENCIA: No se pudo generar el gráfico de progreso: {e}")
+            if stop:
+                return
@@ -0,0 +1,31 @@
+import random
+import zlib
+import numpy as np
+import torch
+
+def derive_seed(seed, *keys):
+    """
+    Deriva una semilla independiente a partir de `seed` y de una secuencia de
+    claves (nombres de flujo como 'game', id de actor, número de partida...).
+    Con `seed=None` devuelve None, de modo que todo lo que dependa de ella
+    sigue siendo no reproducible.
+    """
+    if seed is None:
+        return None
+    # Las claves de texto se convierten a enteros de forma estable entre ejecuciones
+    entropy = [zlib.crc32(key.encode()) if isinstance(key, str) else key for key in keys]
+    return int(np.random.SeedSequence([seed, *entropy]).generate_state(1)[0])
+
+def seed_everything(seed, deterministic=True):
+    """
+    Fija los generadores globales (random, NumPy y PyTorch) y, si `deterministic`,
+    obliga a PyTorch a usar solo algoritmos deterministas. No hace nada si `seed` es None.
+    """
+    if seed is None:
+        return
+    random.seed(seed)
+    np.random.seed(seed)
+    torch.manual_seed(seed)
+    if deterministic:
+        torch.use_deterministic_algorithms(True)
+        torch.backends.cudnn.benchmark = False
@@ -0,0 +1,165 @@
+import numpy as np
+from config import STATS_WINDOW, PLOT_MAX_POINTS
+
+class DownsampledHistory:
+    """
+    Historial de puntajes con memoria acotada para graficar.
+    Agrupa las partidas en cubetas del mismo tamaño; cuando hay `max_points`
+    cubetas completas, las fusiona de dos en dos (el tamaño de cubeta se duplica).
+    Así el gráfico nunca tiene más de `max_points` puntos por línea.
+    """
+    def __init__(self, max_points=PLOT_MAX_POINTS):
+        self.max_points = max(2, max_points - max_points % 2)
+        self.bucket_size = 1
+        self.game_numbers = []  # Última partida de cada cubeta
+        self.scores = []        # Puntaje medio de cada cubeta
+        self.mean_scores = []   # Media acumulada al final de cada cubeta
+        self._pending = []      # Cubeta en construcción: puntajes
+        self._n_games = 0
+        self._last_mean = 0.0
+
+    def add(self, score, mean_score):
+        self._n_games += 1
+        self._last_mean = mean_score
+        self._pending.append(score)
+        if len(self._pending) == self.bucket_size:
+            self._close_bucket()
+
+    def _close_bucket(self):
+        self.game_numbers.append(self._n_games)
+        self.scores.append(sum(self._pending) / len(self._pending))
+        self.mean_scores.append(self._last_mean)
+        self._pending = []
+        if len(self.scores) >= self.max_points:
+            # Fusionar pares de cubetas del mismo tamaño
+            self.game_numbers = self.game_numbers[1::2]
+            self.scores = [(a + b) / 2 for a, b in zip(self.scores[0::2], self.scores[1::2])]
+            self.mean_scores = self.mean_scores[1::2]
+            self.bucket_size *= 2
+
+    def state_dict(self):
+        return {
+            'max_points': self.max_points, 'bucket_size': self.bucket_size,
+            'game_numbers': list(self.game_numbers), 'scores': list(self.scores),
+            'mean_scores': list(self.mean_scores), 'pending': list(self._pending),
+            'n_games': self._n_games, 'last_mean': self._last_mean,
+        }
+
+    def load_state_dict(self, state):
+        self.max_points = state['max_points']
+        self.bucket_size = state['bucket_size']
+        self.game_numbers = list(state['game_numbers'])
+        self.scores = list(state['scores'])
+        self.mean_scores = list(state['mean_scores'])
+        self._pending = list(state['pending'])
+        self._n_games = state['n_games']
+        self._last_mean = state['last_mean']
+
+    def snapshot(self):
+        """Copia de las series actuales (incluida la cubeta incompleta) para graficar."""
+        game_numbers, scores, mean_scores = list(self.game_numbers), list(self.scores), list(self.mean_scores)
+        if self._pending:
+            game_numbers.append(self._n_games)
+            scores.append(sum(self._pending) / len(self._pending))
+            mean_scores.append(self._last_mean)
+        return game_numbers, scores, mean_scores, self.bucket_size
+
+class ScoreTracker:
+    """
+    Estadísticas de puntajes con memoria acotada para entrenamientos muy largos.
+    En vez de guardar la lista completa de puntajes mantiene:
+    - contador, suma y récord (media acumulada en O(1));
+    - un buffer circular de las últimas `window` partidas (media móvil en O(1));
+    - un histograma de puntajes (percentiles exactos sin guardar cada partida);
+    - un historial reducido para el gráfico de progreso (DownsampledHistory).
+    """
+    def __init__(self, window=STATS_WINDOW, max_points=PLOT_MAX_POINTS):
+        self.n_games = 0
+        self.total = 0
+        self.record = 0
+        self._window = np.zeros(window, dtype=np.int64)
+        self._window_sum = 0
+        self._histogram = np.zeros(64, dtype=np.int64)
+        self.history = DownsampledHistory(max_points)
+
+    def add(self, score):
+        """Registra el puntaje de una partida. Devuelve True si es un nuevo récord."""
+        score = int(score)
+        slot = self.n_games % len(self._window)
+        self._window_sum += score - self._window[slot]
+        self._window[slot] = score
+
+        if score >= len(self._histogram):
+            # Crecer el histograma al doble (o lo necesario) conservando los conteos
+            grown = np.zeros(max(2 * len(self._histogram), score + 1), dtype=np.int64)
+            grown[:len(self._histogram)] = self._histogram
+            self._histogram = grown
+        self._histogram[score] += 1
+
+        self.n_games += 1
+        self.total += score
+        self.history.add(score, self.mean)
+
+        is_record = score > self.record
+        if is_record:
+            self.record = score
+        return is_record
+
+    @property
+    def mean(self):
+        """Media de todos los puntajes."""
+        return self.total / self.n_games if self.n_games else 0.0
+
+    @property
+    def moving_average(self):
+        """Media de las últimas `window` partidas."""
+        count = min(self.n_games, len(self._window))
+        return self._window_sum / count if count else 0.0
+
+    def percentile(self, q):
+        """Percentil `q` (0-100) de todos los puntajes, calculado desde el histograma."""
+        if self.n_games == 0:
+            return 0
+        rank = q / 100 * (self.n_games - 1)
+        return int(np.searchsorted(np.cumsum(self._histogram), rank, side='right'))
+
+    def summary(self):
+        """Resumen para la consola o el registro de métricas."""
+        return {
+            'n_games': self.n_games,
+            'mean_score': self.mean,
+            'moving_average': self.moving_average,
+            'record': self.record,
+            'p50': self.percentile(50),
+            'p90': self.percentile(90),
+            'p99': self.percentile(99),
+        }
+
+    def recent_scores(self):
+        """Puntajes de las últimas `window` partidas, en orden cronológico."""
+        count = min(self.n_games, len(self._window))
+        start = self.n_games - count
+        return [int(self._window[i % len(self._window)]) for i in range(start, self.n_games)]
+
+    def state_dict(self):
+        return {
+            'n_games': self.n_games,
+            'total': self.total,
+            'record': self.record,
+            'recent': self.recent_scores(),
+            'histogram': self._histogram.copy(),
+            'history': self.history.state_dict(),
+        }
+
+    def load_state_dict(self, state):
+        self.n_games = state['n_games']
+        self.total = state['total']
+        self.record = state['record']
+        # Rellenar la ventana con las partidas recientes (sirve aunque cambie su tamaño)
+        recent = state['recent'][-len(self._window):]
+        self._window[:] = 0
+        for i, score in enumerate(recent, start=self.n_games - len(recent)):
+            self._window[i % len(self._window)] = score
+        self._window_sum = int(sum(recent))
+        self._histogram = np.asarray(state['histogram'], dtype=np.int64).copy()
+        self.history.load_state_dict(state['history'])